@@ -10,25 +10,41 @@ Estratégias disponíveis:
 4. MACD + RSI Trend Reversal (80% WIN RATE)
 """
 
-import tkinter as tk
-from tkinter import messagebox
-import customtkinter as ctk
 import threading
+import multiprocessing
 import time
 import json
 import os
 import sys  # <--- ADICIONADO PARA A CORREÇÃO
+import itertools
 from datetime import datetime, timedelta
-import pandas as pd
 import numpy as np
 import logging
-import ta # Importa a biblioteca de análise técnica
+from collections import deque
+from candle_store import CandleStore, CandleArrays, BASE_TIMEFRAME, normalize_candle
+import candle_patterns
+import indicators
+from executors import AccountExecutor, PaperExecutor
+from risk import RiskEngine
+from correlation import ReturnCorrelation
+from scheduler import PairScheduler, CandleClock, WorkerPool, DelayedTasks
+from replay import SessionRecorder
+from tick_cache import TickCache
+from strategy_registry import StrategyRegistry
+from memory_monitor import FootprintMonitor
 
 try:
     from exnovaapi.stable_api import Exnova
 except ImportError:
-    messagebox.showerror("Erro Crítico de Dependência", "A biblioteca da API (exnovaapi) não foi encontrada.\n\nExecute o 'EXECUTAR_BOT.py' e escolha a opção 1 para instalar as dependências.")
-    exit()
+    Exnova = None # O erro é mostrado ao abrir a interface ou ao conectar
+
+# Toolkits gráficos só são importados pela interface desktop (ver load_gui_toolkit);
+# web_app.py e main_kivy.py usam o bot sem carregar o tkinter.
+tk = None; ctk = None; messagebox = None
+
+ASSET_CACHE_FILE = 'asset_catalog_cache.json' # Último catálogo de pares/payouts, usado logo ao conectar
+SIGNAL_CARDS_SHOWN = 50 # Cartões de sinal exibidos na aba Sinais
+MAX_CANDLES_PER_REQUEST = 1000 # Limite de velas por chamada de get_candles
 
 # --- FUNÇÃO DE CORREÇÃO PARA PYINSTALLER ---
 def resource_path(relative_path):
@@ -42,29 +58,44 @@ def resource_path(relative_path):
     return os.path.join(base_path, relative_path)
 # --- FIM DA FUNÇÃO DE CORREÇÃO ---
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[logging.FileHandler('sinalizador_alpha_v5.log', encoding='utf-8'), logging.StreamHandler()]
-)
 logger = logging.getLogger(__name__)
 
-ctk.set_appearance_mode("dark")
-ctk.set_default_color_theme("blue")
+def configure_logging():
+    """ Configura o log do bot, a menos que o programa que o importou já tenha configurado o seu """
+    if logging.getLogger().handlers: return
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[logging.FileHandler('sinalizador_alpha_v5.log', encoding='utf-8'), logging.StreamHandler()]
+    )
+
+def load_gui_toolkit():
+    """ Importa tkinter/customtkinter na primeira vez que a interface desktop é criada """
+    global tk, ctk, messagebox
+    if ctk is not None: return
+    import tkinter as tk
+    from tkinter import messagebox
+    import customtkinter as ctk
+    ctk.set_appearance_mode("dark")
+    ctk.set_default_color_theme("blue")
 
 class TradingStrategyReal:
+    timeframes = (BASE_TIMEFRAME,)  # Timeframes (em segundos) usados pela estratégia; o primeiro é o principal
+    expiration = None               # Expiração em minutos; None usa a configuração 'expiration'
+    wants_frame = False             # True entrega pd.DataFrame (data.to_frame()) em vez de CandleArrays para analyze()
+
     def __init__(self, name: str, config: dict):
         self.name = name
         self.config = config
 
-    def is_volatile(self, data: pd.DataFrame) -> bool:
+    def is_volatile(self, data: CandleArrays) -> bool:
         if self.config.get('enable_volatility_filter', False):
             try:
                 atr_period = 14
                 if len(data) < atr_period: return False
-                atr = ta.volatility.average_true_range(data['high'], data['low'], data['close'], window=atr_period)
-                last_atr = atr.iloc[-2]
-                last_close = data['close'].iloc[-2]
+                atr = indicators.average_true_range(data['high'], data['low'], data['close'], window=atr_period)
+                last_atr = atr[-2]
+                last_close = data['close'][-2]
                 normalized_atr = (last_atr / last_close) * 100
                 
                 volatility_threshold = 0.15 
@@ -75,9 +106,14 @@ class TradingStrategyReal:
                 logger.error(f"Erro no filtro de volatilidade: {e}")
         return False
 
-    def analyze(self, data: pd.DataFrame) -> dict:
+    def analyze(self, data: CandleArrays) -> dict:
         raise NotImplementedError
 
+    def analyze_frames(self, frames: dict) -> dict:
+        """ Recebe um CandleArrays por timeframe declarado. Sobrescreva para combinar timeframes. """
+        data = frames[self.timeframes[0]]
+        return self.analyze(data.to_frame() if self.wants_frame else data)
+
 # --- NOVAS ESTRATÉGIAS IMPLEMENTADAS ---
 
 class PocketOptionVolumeStrategy(TradingStrategyReal):
@@ -86,113 +122,92 @@ class PocketOptionVolumeStrategy(TradingStrategyReal):
         self.RSI_PERIOD = 14
         self.VOLUME_AVG_PERIOD = 20
         self.VOLUME_FACTOR = 1.5
+        self.RSI_OVERSOLD = 30
+        self.RSI_OVERBOUGHT = 70
 
-    def analyze(self, data: pd.DataFrame) -> dict:
+    def analyze(self, data: CandleArrays) -> dict:
         try:
             if len(data) < max(self.RSI_PERIOD, self.VOLUME_AVG_PERIOD):
                 return {"signal": None}
 
-            data[['open', 'high', 'low', 'close', 'volume']] = data[['open', 'high', 'low', 'close', 'volume']].apply(pd.to_numeric)
+            rsi = indicators.rsi(data['close'], window=self.RSI_PERIOD)
+            volume_avg = indicators.sma(data['volume'], self.VOLUME_AVG_PERIOD)
             
-            rsi = ta.momentum.rsi(data['close'], window=self.RSI_PERIOD)
-            volume_avg = data['volume'].rolling(window=self.VOLUME_AVG_PERIOD).mean()
-            
-            last_candle = data.iloc[-2]
-            last_rsi = rsi.iloc[-2]
-            last_volume = last_candle['volume']
-            last_volume_avg = volume_avg.iloc[-2]
+            last_close = float(data['close'][-2])
+            last_rsi = rsi[-2]
+            last_volume = data['volume'][-2]
+            last_volume_avg = volume_avg[-2]
 
             is_high_volume = last_volume > (last_volume_avg * self.VOLUME_FACTOR)
 
-            if last_rsi < 30 and is_high_volume:
+            if last_rsi < self.RSI_OVERSOLD and is_high_volume:
                 logger.info(f"Análise {self.name}: Sinal de COMPRA detectado (RSI={last_rsi:.2f}, Volume Alto)")
-                return {"signal": "call", "entry_price": last_candle['close'], "assertiveness": 82.0}
+                return {"signal": "call", "entry_price": last_close, "assertiveness": 82.0}
 
-            if last_rsi > 70 and is_high_volume:
+            if last_rsi > self.RSI_OVERBOUGHT and is_high_volume:
                 logger.info(f"Análise {self.name}: Sinal de VENDA detectado (RSI={last_rsi:.2f}, Volume Alto)")
-                return {"signal": "put", "entry_price": last_candle['close'], "assertiveness": 82.0}
+                return {"signal": "put", "entry_price": last_close, "assertiveness": 82.0}
 
             return {"signal": None}
         except Exception as e:
             logger.error(f"Erro na estratégia '{self.name}': {e}")
             return {"signal": None}
 
-class EngulfingPatternStrategy(TradingStrategyReal):
-    def __init__(self, config: dict):
-        super().__init__("Engulfing Pattern (85%)", config)
-
-    def analyze(self, data: pd.DataFrame) -> dict:
+class CandlePatternStrategy(TradingStrategyReal):
+    """ Estratégia composta pelas máscaras de candle_patterns: CALL_PATTERNS geram compra e PUT_PATTERNS venda (nessa ordem) """
+    CALL_PATTERNS = ()
+    PUT_PATTERNS = ()
+    ASSERTIVENESS = 0.0
+
+    def signal_masks(self, data, tail=None):
+        """ Máscaras (compra, venda) sobre o histórico; tail=N avalia só as últimas N velas """
+        masks = candle_patterns.scan(data, self.CALL_PATTERNS + self.PUT_PATTERNS, tail=tail)
+        call_mask = np.logical_or.reduce([masks[name] for name in self.CALL_PATTERNS]) if self.CALL_PATTERNS else None
+        put_mask = np.logical_or.reduce([masks[name] for name in self.PUT_PATTERNS]) if self.PUT_PATTERNS else None
+        return masks, call_mask, put_mask
+
+    def backtest_signals(self, data) -> np.ndarray:
+        """ Sinal de cada vela do histórico ('call', 'put' ou None), com a mesma lógica da análise ao vivo """
+        _, call_mask, put_mask = self.signal_masks(data)
+        signals = np.full(len(data), None, dtype=object)
+        if put_mask is not None: signals[put_mask] = 'put'
+        if call_mask is not None: signals[call_mask] = 'call'
+        return signals
+
+    def analyze(self, data: CandleArrays) -> dict:
         try:
-            if len(data) < 3:
+            lookback = max(candle_patterns.PATTERNS[name][3] for name in self.CALL_PATTERNS + self.PUT_PATTERNS)
+            if len(data) < lookback + 1:
                 return {"signal": None}
 
-            data[['open', 'high', 'low', 'close']] = data[['open', 'high', 'low', 'close']].apply(pd.to_numeric)
-            
-            candle_atual = data.iloc[-2]
-            candle_anterior = data.iloc[-3]
-
-            # Bullish Engulfing
-            is_bullish_engulfing = (candle_anterior['close'] < candle_anterior['open'] and # Anterior é vermelha
-                                    candle_atual['close'] > candle_atual['open'] and      # Atual é verde
-                                    candle_atual['open'] < candle_anterior['close'] and
-                                    candle_atual['close'] > candle_anterior['open'])
-            
-            if is_bullish_engulfing:
-                logger.info(f"Análise {self.name}: Sinal de COMPRA detectado (Bullish Engulfing)")
-                return {"signal": "call", "entry_price": candle_atual['close'], "assertiveness": 85.0}
-
-            # Bearish Engulfing
-            is_bearish_engulfing = (candle_anterior['close'] > candle_anterior['open'] and # Anterior é verde
-                                    candle_atual['close'] < candle_atual['open'] and      # Atual é vermelha
-                                    candle_atual['open'] > candle_anterior['close'] and
-                                    candle_atual['close'] < candle_anterior['open'])
-
-            if is_bearish_engulfing:
-                logger.info(f"Análise {self.name}: Sinal de VENDA detectado (Bearish Engulfing)")
-                return {"signal": "put", "entry_price": candle_atual['close'], "assertiveness": 85.0}
+            masks, _, _ = self.signal_masks(data, tail=2) # [-2] é a última vela fechada
+            entry_price = float(np.asarray(data['close'], dtype=np.float64)[-2])
+            for direction, names, label in (("call", self.CALL_PATTERNS, "COMPRA"), ("put", self.PUT_PATTERNS, "VENDA")):
+                matched = next((name for name in names if masks[name][-2]), None)
+                if matched:
+                    logger.info(f"Análise {self.name}: Sinal de {label} detectado ({candle_patterns.label(matched)})")
+                    return {"signal": direction, "entry_price": entry_price, "assertiveness": self.ASSERTIVENESS}
 
             return {"signal": None}
         except Exception as e:
             logger.error(f"Erro na estratégia '{self.name}': {e}")
             return {"signal": None}
 
-class HammerPatternStrategy(TradingStrategyReal):
-    def __init__(self, config: dict):
-        super().__init__("Hammer & Hanging Man (75%)", config)
+class EngulfingPatternStrategy(CandlePatternStrategy):
+    CALL_PATTERNS = ('bullish_engulfing',)
+    PUT_PATTERNS = ('bearish_engulfing',)
+    ASSERTIVENESS = 85.0
 
-    def analyze(self, data: pd.DataFrame) -> dict:
-        try:
-            if len(data) < 2:
-                return {"signal": None}
-
-            data[['open', 'high', 'low', 'close']] = data[['open', 'high', 'low', 'close']].apply(pd.to_numeric)
-            
-            candle = data.iloc[-2]
-            
-            body_size = abs(candle['close'] - candle['open'])
-            if body_size == 0: body_size = 1e-5 # Evita divisão por zero
-            
-            upper_shadow = candle['high'] - max(candle['open'], candle['close'])
-            lower_shadow = min(candle['open'], candle['close']) - candle['low']
-
-            # Hammer Pattern (Sinal de Compra)
-            is_hammer = (lower_shadow > 2 * body_size and upper_shadow < 0.5 * body_size)
-            
-            if is_hammer:
-                logger.info(f"Análise {self.name}: Sinal de COMPRA detectado (Hammer)")
-                return {"signal": "call", "entry_price": candle['close'], "assertiveness": 75.0}
+    def __init__(self, config: dict):
+        super().__init__("Engulfing Pattern (85%)", config)
 
-            # Hanging Man / Shooting Star Pattern (Sinal de Venda)
-            is_hanging_man = (upper_shadow > 2 * body_size and lower_shadow < 0.5 * body_size)
-            
-            if is_hanging_man:
-                logger.info(f"Análise {self.name}: Sinal de VENDA detectado (Hanging Man / Shooting Star)")
-                return {"signal": "put", "entry_price": candle['close'], "assertiveness": 75.0}
+class HammerPatternStrategy(CandlePatternStrategy):
+    CALL_PATTERNS = ('hammer',)
+    PUT_PATTERNS = ('shooting_star',) # Hanging Man / Shooting Star
+    ASSERTIVENESS = 75.0
 
-            return {"signal": None}
-        except Exception as e:
-            logger.error(f"Erro na estratégia '{self.name}': {e}")
-            return {"signal": None}
+    def __init__(self, config: dict):
+        super().__init__("Hammer & Hanging Man (75%)", config)
 
 class MacdRsiReversalStrategy(TradingStrategyReal):
     def __init__(self, config: dict):
@@ -201,42 +216,40 @@ class MacdRsiReversalStrategy(TradingStrategyReal):
         self.MACD_FAST = 12
         self.MACD_SLOW = 26
         self.MACD_SIGN = 9
+        self.RSI_BUY_ZONE = (25, 40)
+        self.RSI_SELL_ZONE = (60, 75)
 
-    def analyze(self, data: pd.DataFrame) -> dict:
+    def analyze(self, data: CandleArrays) -> dict:
         try:
             if len(data) < self.MACD_SLOW:
                 return {"signal": None}
             
-            data[['open', 'high', 'low', 'close']] = data[['open', 'high', 'low', 'close']].apply(pd.to_numeric)
+            rsi = indicators.rsi(data['close'], window=self.RSI_PERIOD)
+            macd_line, signal_line = indicators.macd(data['close'], fast=self.MACD_FAST, slow=self.MACD_SLOW, sign=self.MACD_SIGN)
+
+            last_rsi = rsi[-2]
+            prev_macd = macd_line[-3]
+            last_macd = macd_line[-2]
+            prev_signal = signal_line[-3]
+            last_signal = signal_line[-2]
             
-            rsi = ta.momentum.rsi(data['close'], window=self.RSI_PERIOD)
-            macd_obj = ta.trend.MACD(close=data['close'], window_fast=self.MACD_FAST, window_slow=self.MACD_SLOW, window_sign=self.MACD_SIGN)
-            macd_line = macd_obj.macd()
-            signal_line = macd_obj.macd_signal()
-
-            last_rsi = rsi.iloc[-2]
-            prev_macd = macd_line.iloc[-3]
-            last_macd = macd_line.iloc[-2]
-            prev_signal = signal_line.iloc[-3]
-            last_signal = signal_line.iloc[-2]
-            
-            candle = data.iloc[-2]
+            last_close = float(data['close'][-2])
 
             # Bullish Signal
             macd_crossover_bullish = prev_macd < prev_signal and last_macd > last_signal
-            rsi_in_bullish_zone = 25 < last_rsi < 40
+            rsi_in_bullish_zone = self.RSI_BUY_ZONE[0] < last_rsi < self.RSI_BUY_ZONE[1]
 
             if macd_crossover_bullish and rsi_in_bullish_zone:
                 logger.info(f"Análise {self.name}: Sinal de COMPRA detectado (MACD Crossover + RSI={last_rsi:.2f})")
-                return {"signal": "call", "entry_price": candle['close'], "assertiveness": 80.0}
+                return {"signal": "call", "entry_price": last_close, "assertiveness": 80.0}
 
             # Bearish Signal
             macd_crossover_bearish = prev_macd > prev_signal and last_macd < last_signal
-            rsi_in_bearish_zone = 60 < last_rsi < 75
+            rsi_in_bearish_zone = self.RSI_SELL_ZONE[0] < last_rsi < self.RSI_SELL_ZONE[1]
 
             if macd_crossover_bearish and rsi_in_bearish_zone:
                 logger.info(f"Análise {self.name}: Sinal de VENDA detectado (MACD Crossover + RSI={last_rsi:.2f})")
-                return {"signal": "put", "entry_price": candle['close'], "assertiveness": 80.0}
+                return {"signal": "put", "entry_price": last_close, "assertiveness": 80.0}
 
             return {"signal": None}
         except Exception as e:
@@ -245,27 +258,87 @@ class MacdRsiReversalStrategy(TradingStrategyReal):
 
 # --- FIM DAS NOVAS ESTRATÉGIAS ---
 
+# Estratégias embutidas: nome exibido -> classe (plugins de strategies/ e entry points são somados pelo StrategyRegistry)
+STRATEGY_CLASSES = {
+    'Engulfing Pattern (85%)': EngulfingPatternStrategy,
+    'Pocket Option + Volume (82%)': PocketOptionVolumeStrategy,
+    'MACD + RSI Reversal (80%)': MacdRsiReversalStrategy,
+    'Hammer & Hanging Man (75%)': HammerPatternStrategy
+}
+
+def create_strategy_registry(config: dict) -> StrategyRegistry:
+    """ Registro com as estratégias embutidas e os plugins, já instanciados com a configuração (bot e processos de análise) """
+    registry = StrategyRegistry(TradingStrategyReal, STRATEGY_CLASSES); registry.refresh(config)
+    return registry
+
 
 class SinalizadorAlphaReal:
-    def __init__(self):
-        self.root = ctk.CTk()
+    # Contadores de P&L ficam no motor de risco (atualizações atômicas entre as threads de trade)
+    total_profit = property(lambda self: self.risk.total_profit)
+    total_operations = property(lambda self: self.risk.total_operations)
+    total_wins = property(lambda self: self.risk.total_wins)
+    total_losses = property(lambda self: self.risk.total_losses)
+
+    def __init__(self, gui_mode='tk', update_callback=None, clock=time):
+        # gui_mode='tk' abre a interface desktop; qualquer outro valor (web, kivy, replay) roda sem tkinter
+        # e envia as atualizações para update_callback. clock (time() e sleep()) é trocado pelo relógio virtual no replay
+        configure_logging()
+        self.gui_mode = gui_mode; self.update_callback = update_callback; self.root = None; self.clock = clock
+        if gui_mode == 'tk':
+            load_gui_toolkit(); self.root = ctk.CTk()
+            if Exnova is None: messagebox.showerror("Erro Crítico de Dependência", "A biblioteca da API (exnovaapi) não foi encontrada.\n\nExecute o 'EXECUTAR_BOT.py' e escolha a opção 1 para instalar as dependências."); sys.exit(1)
         self.colors = {'bg_main': '#0F172A', 'bg_secondary': '#1E293B', 'card': '#334155', 'primary': '#2563EB', 'green': '#10B981', 'red': '#EF4444', 'yellow': '#F59E0B', 'text_primary': '#F8FAFC', 'text_secondary': '#94A3B8'}
-        self.setup_window()
-        self.exnova_api = None; self.connected = False; self.trading = False; self.balance = 0.0; self.total_profit = 0.0; self.total_operations = 0; self.total_wins = 0; self.total_losses = 0;
-        self.config = {}; self.signals = []
+        if self.root: self.setup_window()
+        self.exnova_api = None; self.connected = False; self.trading = False; self.balance = 0.0; self.risk = RiskEngine()
+        self.config = {}; self._config_mtime = None
         self.load_real_config() # Carrega config antes de instanciar estratégias
+        self.signals = deque(maxlen=max(SIGNAL_CARDS_SHOWN, int(self.config['max_signals_kept'])))  # Os mais antigos saem sozinhos
+        # Trades e verificações de resultado em threads fixas e uma única fila de agendamento (não uma thread/Timer por ordem)
+        self.trade_pool = WorkerPool(int(self.config['max_trade_threads'])); self.tasks = DelayedTasks(self.trade_pool, clock)
         
-        # --- DICIONÁRIO DE ESTRATÉGIAS ATUALIZADO ---
-        self.strategies = {
-            'Engulfing Pattern (85%)': EngulfingPatternStrategy(self.config),
-            'Pocket Option + Volume (82%)': PocketOptionVolumeStrategy(self.config),
-            'MACD + RSI Reversal (80%)': MacdRsiReversalStrategy(self.config),
-            'Hammer & Hanging Man (75%)': HammerPatternStrategy(self.config)
-        }
-        # ----------------------------------------------
+        self.strategy_registry = create_strategy_registry(self.config); self.strategies = self.strategy_registry.strategies
+        self.candle_window = 100  # Barras de cada timeframe entregues às estratégias
+        self.candle_store = CandleStore(timeframes={tf for s in self.strategies.values() for tf in s.timeframes}, window=self.candle_window)
         
         self.available_otc_pairs = []; self.payouts = {}; self.min_payout = 85
-        self.create_real_interface(); self.start_background_thread()
+        # Contas extras (config['accounts']) recebem os mesmos sinais sem baixar velas novamente
+        self.executors = AccountExecutor.from_config(self.config, self.min_payout, self.candle_store, clock)
+        # As contas têm threads próprias, uma por conta: as ordens de todas saem juntas na vela de entrada
+        self.account_pool = WorkerPool(len(self.executors), name='conta') if self.executors else None
+        for executor in self.executors: executor.pool = self.account_pool; executor.tasks = self.tasks
+        # Modo 'Analisar': ordens simuladas preenchidas pelas velas já baixadas (diário journal_analisar.jsonl)
+        self.paper = PaperExecutor('analisar', self.config, self.candle_store, self.min_payout, clock, enforce_limits=False)
+        self.pair_scheduler = PairScheduler(top_pairs=int(self.config['priority_top_pairs']), rescan_interval=int(self.config['priority_rescan_interval']), clock=clock)
+        self.candle_clock = CandleClock(offset=float(self.config['sweep_offset']), deadline=float(self.config['sweep_deadline']), clock=clock)
+        self.asset_cache_file = ASSET_CACHE_FILE
+        self._pending_trade_pairs = set()  # Pares com trade aguardando entrada; não são reanalisados
+        self._signal_ids = itertools.count(1)  # Ids dos sinais: únicos e iguais a cada replay (o horário virtual se repete)
+        self.quotes = TickCache(self.candle_store, lambda: self.exnova_api, clock=clock)  # Gap e preço de entrada sem chamadas extras
+        self.analysis_pool = None  # Processos de análise (config['analysis_workers'] > 0), criados na primeira varredura
+        self.correlation = ReturnCorrelation(window=int(self.config['correlation_window']))
+        self.monitor = FootprintMonitor(float(self.config['memory_report_interval']), tracemalloc_frames=1 if self.config['memory_tracemalloc'] else 0, sizes={
+            'signals': lambda: len(self.signals), 'trades_na_fila': self.trade_pool.pending, 'tarefas_agendadas': lambda: len(self.tasks),
+            'pares_em_memoria': lambda: len(self.candle_store.pairs()), 'cartoes_de_sinal': lambda: len(self._signal_cards)})
+        self._signal_cards = {}; self._signals_placeholder = None; self._pairs_rendered = None  # Estado já desenhado na interface Tk
+        if self.root: self.create_real_interface()
+        self.start_background_thread()
+
+    def _schedule(self, delay_ms, callback):
+        """ Agenda na thread da interface Tk ou, sem interface, na fila de tarefas agendadas """
+        if self.root is not None: self.root.after(delay_ms, callback); return
+        self.tasks.schedule(delay_ms / 1000, callback)
+
+    def _now(self):
+        return datetime.fromtimestamp(self.clock.time())
+
+    def _notify(self, data):
+        if self.update_callback:
+            try: self.update_callback(data)
+            except Exception as e: logger.error(f"Erro no callback de atualização: {e}")
+
+    def _alert(self, title, message, level='error'):
+        if self.root is None: logger.warning(f"{title}: {message}"); return
+        {'error': messagebox.showerror, 'warning': messagebox.showwarning, 'info': messagebox.showinfo}[level](title, message)
 
     def setup_window(self):
         self.root.title("🚀 SINALIZADOR ALPHA v5.0 - ESTRATÉGIAS WIN")
@@ -288,6 +361,7 @@ class SinalizadorAlphaReal:
                 self.config = {}
             # --- FIM DA MODIFICAÇÃO ---
             
+            self._config_mtime = os.path.getmtime(config_file_path) if os.path.exists(config_file_path) else None
             defaults = {
                 'email': '', 'password': '', 'account_type': 'PRACTICE',
                 'entry_value': 5.0, 'stop_win': 100.0, 'stop_loss': 50.0,
@@ -295,7 +369,13 @@ class SinalizadorAlphaReal:
                 'operation_mode': 'Operar',
                 'optimized_entry': True, 'enable_gap_filter': False,
                 'enable_martingale': False,
-                'enable_volatility_filter': False
+                'enable_volatility_filter': False,
+                'expiration': 1,
+                'priority_top_pairs': 20, 'priority_rescan_interval': 3,
+                'sweep_offset': 1.0, 'sweep_deadline': 20.0, 'sweep_pair_delay': 0.1,
+                'record_session': '', 'analysis_workers': 0, 'strategy_params': {},
+                'correlation_window': 60, 'correlation_threshold': 0.8, 'max_signals_per_cluster': 1, 'max_trades_per_sweep': 1,
+                'max_signals_kept': 500, 'max_trade_threads': 8, 'memory_report_interval': 900, 'memory_tracemalloc': False
             }
             for k, v in defaults.items(): self.config.setdefault(k, v)
         except Exception as e: logger.error(f"Erro ao carregar config: {e}")
@@ -308,16 +388,24 @@ class SinalizadorAlphaReal:
             for key in ['entry_value', 'stop_win', 'stop_loss']:
                 try: self.config[key] = float(self.ui_vars[key].get())
                 except (ValueError, TypeError): self.config[key] = {'entry_value': 5.0, 'stop_win': 100.0, 'stop_loss': 50.0}[key]
-            config_to_save = self.config.copy(); config_to_save.pop('password', None)
-            
-            # ATENÇÃO: Salvamos sempre no diretório do programa, não no temporário do PyInstaller
-            with open('config_real.json', 'w', encoding='utf-8') as f:
-                json.dump(config_to_save, f, indent=4)
-                
+            try: self.config['expiration'] = int(self.ui_vars['expiration'].get())
+            except (ValueError, TypeError): self.config['expiration'] = 1
+            self._write_config()
             messagebox.showinfo("Sucesso", "Configurações salvas!")
-            self.root.after(0, self.update_dashboard_ui)
+            self._schedule(0, self.update_dashboard_ui)
         except Exception as e: messagebox.showerror("Erro ao Salvar", f"Não foi possível salvar as configurações: {e}")
 
+    def save_real_config_from_kivy(self):
+        try: self._write_config(); self._schedule(0, self.update_dashboard_ui)
+        except Exception as e: logger.error(f"Não foi possível salvar as configurações: {e}")
+
+    def _write_config(self):
+        config_to_save = self.config.copy(); config_to_save.pop('password', None)
+        # ATENÇÃO: Salvamos sempre no diretório do programa, não no temporário do PyInstaller
+        with open('config_real.json', 'w', encoding='utf-8') as f:
+            json.dump(config_to_save, f, indent=4)
+        if self.analysis_pool: self.analysis_pool.set_config(self.config)
+
     def create_real_interface(self):
         ctk.CTkLabel(self.root, text="🚀 SINALIZADOR ALPHA", font=ctk.CTkFont(size=24, weight="bold"), text_color=self.colors['text_primary']).pack(pady=(20, 5))
         ctk.CTkLabel(self.root, text="Bot de Trading Automático para Exnova", font=ctk.CTkFont(size=14), text_color=self.colors['text_secondary']).pack(pady=(0, 20))
@@ -358,6 +446,7 @@ class SinalizadorAlphaReal:
         ctk.CTkLabel(strategy_card, text="Configuração de Trading", font=ctk.CTkFont(size=16, weight="bold")).pack(anchor="w", padx=20, pady=(10, 5))
         create_widget(strategy_card, 'strategy', 'Estratégia:', ctk.CTkOptionMenu, values=list(self.strategies.keys())).pack(fill="x", padx=20, pady=5)
         create_widget(strategy_card, 'operation_mode', 'Modo de Operação:', ctk.CTkOptionMenu, values=['Operar', 'Analisar']).pack(fill="x", padx=20, pady=5)
+        create_widget(strategy_card, 'expiration', 'Expiração (minutos):', ctk.CTkOptionMenu, values=['1', '5', '15']).pack(fill="x", padx=20, pady=5)
         create_widget(strategy_card, 'optimized_entry', 'Otimizar Entrada (Pullback):', ctk.CTkCheckBox).pack(fill="x", padx=20, pady=5)
         create_widget(strategy_card, 'enable_gap_filter', 'Ativar Filtro de GAP:', ctk.CTkCheckBox).pack(fill="x", padx=20, pady=5)
         create_widget(strategy_card, 'enable_martingale', 'Ativar Martingale:', ctk.CTkCheckBox).pack(fill="x", padx=20, pady=5)
@@ -369,79 +458,212 @@ class SinalizadorAlphaReal:
     def analyze_market_loop(self):
         while True:
             if self.trading:
-                strategy = self.strategies.get(self.ui_vars['strategy'].get())
-                if not strategy: logger.error(f"Estratégia não encontrada. Parando o loop."); self.root.after(0, self.toggle_real_trading); break
-                potential_trades = []
-                for pair in self.available_otc_pairs:
+                self.candle_clock.wait_for_next_candle() # Começa logo após o fechamento da vela
+                if not self.trading: continue
+                self.refresh_strategies() # Plugins e parâmetros alterados entram entre uma varredura e outra
+                strategy = self.strategies.get(self.config.get('strategy'))
+                if not strategy: logger.error(f"Estratégia não encontrada. Parando o loop."); self._schedule(0, self.stop_trading); break
+                potential_trades = []; planned = self.pair_scheduler.plan(self.available_otc_pairs, self.payouts, self.min_payout, self.candle_store.volatility); fetched = []; cut = []
+                pool = self._analysis_pool(); batch = []
+                self.candle_clock.begin_sweep()
+                for index, pair in enumerate(planned):
                     if not self.trading: break
+                    if pair in self._pending_trade_pairs: continue
+                    if self.candle_clock.past_deadline(): cut = [p for p in planned[index:] if p not in self._pending_trade_pairs]; break
+                    fetched.append(pair); self.pair_scheduler.mark_scanned(pair)
                     try:
-                        candles = self.exnova_api.get_candles(pair, 60, 100, time.time())
-                        if not candles or not isinstance(candles, list) or not candles[0] or 'open' not in candles[0]: logger.warning(f"Dados inválidos para {pair}."); continue
-                        try: df = pd.DataFrame(candles)
-                        except (ValueError, TypeError) as e: logger.error(f"Erro ao criar DataFrame para {pair}: {e}."); continue
-                        df.rename(columns={'max': 'high', 'min': 'low', 'from': 'timestamp'}, inplace=True)
-                        analysis = strategy.analyze(df)
-                        if analysis and analysis.get("signal"): analysis['pair'] = pair; potential_trades.append(analysis)
+                        if pool: # Só baixa aqui; a análise roda nos processos ao fim da varredura
+                            candles = self.fetch_pair_candles(pair, strategy)
+                            if candles is not None: batch.append((pair, candles))
+                        else:
+                            frames = self.fetch_pair_frames(pair, strategy)
+                            if frames is not None: self._add_potential_trade(potential_trades, pair, strategy.analyze_frames(frames), strategy)
                     except Exception as e: logger.error(f"Erro ao analisar {pair}: {e}")
-                    time.sleep(0.5)
-                if self.trading and potential_trades:
-                    best_trade = max(potential_trades, key=lambda x: x['assertiveness'])
-                    logger.info(f"Sinais encontrados: {len(potential_trades)}. Melhor sinal: {best_trade['pair']} com {best_trade['assertiveness']}% de assertividade.")
-                    threading.Thread(target=self._process_trade_thread, args=(best_trade['pair'], best_trade), daemon=True).start()
-                    time.sleep(60)
-                else: time.sleep(5)
-            else: time.sleep(5)
+                    self.clock.sleep(float(self.config['sweep_pair_delay']))
+                if pool and batch:
+                    history = lambda p: self.candle_store.candles(p, BASE_TIMEFRAME, self.candle_store.history_length(self.candle_window))
+                    for pair, analysis in pool.analyze(strategy.name, batch, history): self._add_potential_trade(potential_trades, pair, analysis, strategy)
+                self.pair_scheduler.defer(cut) # Os pares cortados pelo prazo não contam como varridos e vêm primeiro na próxima
+                self.candle_clock.end_sweep(len(fetched), skipped=len(cut))
+                self.finish_sweep(strategy, fetched, potential_trades)
+            else: self.clock.sleep(5)
+
+    def finish_sweep(self, strategy, fetched, potential_trades):
+        """ Fim de varredura comum ao loop do bot e ao do servidor web: resolve as ordens simuladas e, com o trading ativo,
+        envia os melhores sinais. Retorna os sinais descorrelacionados, do mais para o menos assertivo. """
+        self._update_paper_orders(strategy, fetched)
+        selected = self.select_uncorrelated(potential_trades) if potential_trades else []
+        if not self.trading: return selected
+        for best_trade in selected[:max(1, int(self.config['max_trades_per_sweep']))]:
+            logger.info(f"Sinais encontrados: {len(potential_trades)} ({len(selected)} descorrelacionados). Melhor sinal: {best_trade['pair']} com {best_trade['assertiveness']}% de assertividade.")
+            self._pending_trade_pairs.add(best_trade['pair']); self.quotes.watch(best_trade['pair'])
+            # A espera pela vela de entrada fica na fila de agendamento, não ocupando uma thread de trade
+            wait_time = max(0, 60 - self._now().second)
+            logger.info(f"Sinal de {best_trade['signal'].upper()} para {best_trade['pair']}. Aguardando {wait_time:.1f}s para a próxima vela.")
+            self.tasks.schedule(wait_time, self._process_trade_thread, best_trade['pair'], best_trade)
+        return selected
+
+    def is_pending(self, pair):
+        """ Par com trade aguardando a entrada: não é reanalisado até a ordem sair """
+        return pair in self._pending_trade_pairs
+
+    def refresh_strategies(self):
+        """ Relê config['strategy_params'] se o arquivo mudou e recarrega os plugins alterados, mantendo as velas em memória """
+        try:
+            mtime = os.path.getmtime('config_real.json')
+            if mtime != self._config_mtime:
+                with open('config_real.json', 'r', encoding='utf-8') as f: self.config['strategy_params'] = json.load(f).get('strategy_params', {})
+                self._config_mtime = mtime
+        except (OSError, ValueError) as e: logger.debug(f"config_real.json não relido: {e}")
+        try:
+            if not self.strategy_registry.refresh(self.config): return False
+        except Exception as e: logger.error(f"Erro ao recarregar as estratégias: {e}", exc_info=True); return False
+        self.strategies = self.strategy_registry.strategies
+        for strategy in self.strategies.values():
+            for timeframe in strategy.timeframes: self.candle_store.add_timeframe(timeframe)
+        if self.analysis_pool: self.analysis_pool.set_config(self.config)
+        logger.info(f"Estratégias atualizadas: {', '.join(self.strategies)}")
+        self._notify({'strategies': list(self.strategies)})
+        return True
+
+    def fetch_pair_candles(self, pair, strategy, count=None):
+        """ Baixa só as velas de 1m que faltam para o par e as incorpora ao armazenamento. Retorna a resposta da API ou None. """
+        count = count or self.candle_window
+        for timeframe in strategy.timeframes: self.candle_store.add_timeframe(timeframe)
+        # count barras do maior timeframe: na primeira vez são count x (timeframe / 60s) velas de 1m, em lotes que a API aceita
+        missing = self.candle_store.fetch_count(pair, self.clock.time(), self.candle_store.history_length(count)); end = self.clock.time(); candles = []
+        while missing > 0:
+            chunk = self.exnova_api.get_candles(pair, BASE_TIMEFRAME, min(missing, MAX_CANDLES_PER_REQUEST), end)
+            if not chunk or not isinstance(chunk, list) or not chunk[0] or 'open' not in chunk[0]: break
+            candles = chunk + candles; missing -= len(chunk); end = normalize_candle(chunk[0])['timestamp'] - 1
+            if len(chunk) < MAX_CANDLES_PER_REQUEST: break
+        if not candles: logger.warning(f"Dados inválidos para {pair}."); return None
+        try: new_closed = self.candle_store.update(pair, candles)
+        except (KeyError, ValueError, TypeError) as e: logger.error(f"Erro ao armazenar velas de {pair}: {e}."); return None
+        if new_closed: self.correlation.observe(pair, self.candle_store.candles(pair, BASE_TIMEFRAME, new_closed + 1)[:-1])
+        return candles
+
+    def fetch_pair_frames(self, pair, strategy, count=None):
+        """ Baixa as velas novas do par e devolve um CandleArrays por timeframe da estratégia (sem chamadas extras nem pandas). """
+        count = count or self.candle_window
+        if self.fetch_pair_candles(pair, strategy, count) is None: return None
+        return {tf: self.candle_store.arrays(pair, tf, count) for tf in strategy.timeframes}
+
+    def _paper_executors(self):
+        return [self.paper] + [e for e in self.executors if isinstance(e, PaperExecutor)]
+
+    def _update_paper_orders(self, strategy, fetched_pairs):
+        """ Baixa os pares com ordem simulada em aberto que a varredura não baixou e resolve as ordens com as velas novas """
+        papers = self._paper_executors()
+        for pair in set().union(*(p.watched_pairs() for p in papers)) - set(fetched_pairs):
+            try: self.fetch_pair_candles(pair, strategy)
+            except Exception as e: logger.error(f"Erro ao baixar velas de {pair} para as ordens simuladas: {e}")
+        for paper in papers: paper.poll()
+
+    def _add_potential_trade(self, potential_trades, pair, analysis, strategy):
+        if not analysis or not analysis.get("signal"): return
+        analysis['pair'] = pair; analysis.setdefault('expiration', strategy.expiration or int(self.config.get('expiration', 1))); potential_trades.append(analysis)
+        self.pair_scheduler.record_signal(pair, self.clock.time())
+
+    def _analysis_pool(self):
+        """ Processos de análise conforme config['analysis_workers'] (0 = analisa na própria thread do loop) """
+        from analysis_workers import AnalysisPool
+        workers = int(self.config.get('analysis_workers', 0) or 0)
+        if self.analysis_pool and self.analysis_pool.workers != workers: self.analysis_pool.close(); self.analysis_pool = None
+        if workers > 0 and self.analysis_pool is None: self.analysis_pool = AnalysisPool(workers, self.config, self.candle_window)
+        return self.analysis_pool
+
+    def select_uncorrelated(self, signals):
+        """ Agrupa sinais de pares correlacionados e devolve o melhor de cada grupo, do mais para o menos assertivo """
+        selected = self.correlation.select(signals, float(self.config['correlation_threshold']), int(self.config['max_signals_per_cluster']), self.payouts)
+        if len(selected) < len(signals): logger.info(f"Correlação: {len(signals) - len(selected)} sinais descartados por repetirem o risco de outro par.")
+        return selected
 
     def _process_trade_thread(self, pair, signal_data):
+        """ Entrada do sinal na abertura da vela (agendada por finish_sweep) """
         try:
-            wait_time = max(0, 60 - datetime.now().second)
-            logger.info(f"Sinal de {signal_data['signal'].upper()} para {pair}. Aguardando {wait_time:.1f}s para a próxima vela.")
-            time.sleep(wait_time)
             if self.config['operation_mode'] == 'Operar':
+                for executor in self.executors: executor.submit(pair, signal_data, self.payouts)
                 if self.payouts.get(pair, 0) < self.min_payout: logger.warning(f"TRADE CANCELADO ({pair}): Payout baixo."); return
-                if self.total_profit >= self.config['stop_win']: logger.warning("TRADE CANCELADO: Meta Stop Win atingida."); self.root.after(0, self.toggle_real_trading); return
-                if self.total_profit < 0 and abs(self.total_profit) >= self.config['stop_loss']: logger.warning("TRADE CANCELADO: Limite Stop Loss atingido."); self.root.after(0, self.toggle_real_trading); return
-            self._send_trade(pair, signal_data)
+                risk_ticket = self._reserve_risk(pair, signal_data.get('amount', self.config['entry_value']), "TRADE CANCELADO")
+                if risk_ticket is None: return
+                self._send_trade(pair, signal_data, risk_ticket=risk_ticket); return
+            self._send_paper_trade(pair, signal_data)
         except Exception as e: logger.error(f"Erro CRÍTICO no processamento do trade para {pair}: {e}", exc_info=True)
+        finally: self._pending_trade_pairs.discard(pair)
+
+    def _reserve_risk(self, pair, amount, cancel_label):
+        """ Reserva a exposição da ordem no motor de risco; None se os limites (incluindo ordens em aberto) não permitem """
+        ticket, reason = self.risk.reserve(amount, self.config['stop_win'], self.config['stop_loss'])
+        if ticket is not None: return ticket
+        logger.warning(f"{cancel_label} ({pair}): {reason}.")
+        if self.risk.limit_reached(self.config['stop_win'], self.config['stop_loss']): self._schedule(0, self.stop_trading)
+        return None
 
-    def _send_trade(self, pair, signal_data, is_martingale=False):
+    def stop_trading(self):
+        if self.trading: self.toggle_real_trading()
+
+    def _send_trade(self, pair, signal_data, is_martingale=False, risk_ticket=None):
+        # A reserva de risco só é liberada por confirm/settle ou cancel: qualquer exceção até o envio a cancela
+        try: self._submit_order(pair, signal_data, is_martingale, risk_ticket)
+        except Exception: self.risk.cancel(risk_ticket); raise
+
+    def _submit_order(self, pair, signal_data, is_martingale, risk_ticket):
         amount = signal_data.get('amount', self.config['entry_value'])
         direction = signal_data['signal']
         assertiveness = signal_data.get('assertiveness', 'GALE')
+        expiration = int(signal_data.get('expiration') or self.config.get('expiration', 1))
 
         strategy_name = f"{self.config.get('strategy')} (GALE)" if is_martingale else self.config.get('strategy')
         
-        signal = {'id': time.time(), 'pair': pair, 'direction': direction, 'status': 'AGUARDANDO', 'profit': 0, 'entry_time': datetime.now(), 'exit_time': datetime.now(), 'amount': amount, 'strategy': strategy_name, 'assertiveness': assertiveness}
+        signal = {'id': next(self._signal_ids), 'pair': pair, 'direction': direction, 'status': 'AGUARDANDO', 'profit': 0, 'entry_time': self._now(), 'exit_time': self._now(), 'amount': amount, 'strategy': strategy_name, 'assertiveness': assertiveness, 'expiration': expiration}
         self.signals.append(signal)
 
+        # Gap e preço vêm do cache de cotações (stream da API ou velas da varredura): buy() é a única chamada de rede da entrada
         if self.config.get('enable_gap_filter', False) and not is_martingale:
             try:
-                candles = self.exnova_api.get_candles(pair, 60, 2, time.time())
-                if candles and len(candles) == 2 and candles[0]['open'] != candles[1]['close']:
+                gap = self.quotes.has_gap(pair)
+                if gap:
                     logger.warning(f"TRADE CANCELADO ({pair}): GAP DETECTADO.")
-                    signal['status'] = 'CANCELADO (GAP)'; self.root.after(0, self.update_signals_ui); return
+                    signal['status'] = 'CANCELADO (GAP)'; self.risk.cancel(risk_ticket); self._schedule(0, self.update_signals_ui); return
+                # Sem a vela de entrada (stream ainda vazio) o gap é desconhecido: a ordem segue, como quando as velas não vinham da API
+                if gap is None: logger.warning(f"GAP não verificado ({pair}): vela de entrada indisponível; ordem enviada sem o filtro.")
             except Exception as e: logger.error(f"Erro ao verificar GAP para {pair}: {e}")
 
-        current_price, _ = self._get_current_price(pair)
+        current_price = self.quotes.price(pair)
         if not current_price: 
-            logger.error(f"Não foi possível obter preço para {pair}."); signal['status'] = 'ERRO (PREÇO)'; return
+            logger.error(f"Não foi possível obter preço para {pair}."); signal['status'] = 'ERRO (PREÇO)'; self.risk.cancel(risk_ticket); return
         signal['entry_price'] = current_price
-        self.root.after(0, self.update_signals_ui)
-
-        is_catalog = self.config['operation_mode'] == 'Analisar'
-        if not is_catalog:
-            log_msg = f"Enviando ordem de MARTINGALE:" if is_martingale else "Enviando ordem REAL:"
-            logger.info(f"{log_msg} {direction.upper()} em {pair} | Valor ${amount}")
-            status, order_id = self.exnova_api.buy(amount, pair, direction, 1)
-            if status: 
-                logger.info(f"Ordem {order_id} enviada."); self.total_operations += 1
-                self.root.after(65000, lambda: self.check_trade_result(order_id, amount, signal['id']))
-            else: 
-                logger.error(f"Falha ao enviar ordem para {pair}. API: {order_id}"); signal['status'] = 'ERRO'
-                self.root.after(0, self.update_signals_ui)
-        else:
-            self.total_operations += 1
-            self.root.after(65000, lambda: self.check_trade_result(None, amount, signal['id'], is_catalog=True, pair=pair, entry_price=signal['entry_price'], direction=direction))
+        self._schedule(0, self.update_signals_ui)
+
+        log_msg = f"Enviando ordem de MARTINGALE:" if is_martingale else "Enviando ordem REAL:"
+        logger.info(f"{log_msg} {direction.upper()} em {pair} | Valor ${amount}")
+        status, order_id = self.exnova_api.buy(amount, pair, direction, expiration)
+        if status: 
+            logger.info(f"Ordem {order_id} enviada ({expiration}m)."); self.risk.confirm(risk_ticket)
+            self.tasks.schedule(expiration * 60 + 5, self.check_trade_result, order_id, amount, signal, risk_ticket)
+        else: 
+            logger.error(f"Falha ao enviar ordem para {pair}. API: {order_id}"); signal['status'] = 'ERRO'; self.risk.cancel(risk_ticket)
+            self._schedule(0, self.update_signals_ui)
+
+    def _send_paper_trade(self, pair, signal_data):
+        """ Modo 'Analisar': ordem simulada, preenchida e resolvida pelas velas em memória (nenhuma chamada extra à API) """
+        amount = signal_data.get('amount', self.config['entry_value'])
+        expiration = int(signal_data.get('expiration') or self.config.get('expiration', 1))
+        signal = {'id': next(self._signal_ids), 'pair': pair, 'direction': signal_data['signal'], 'status': 'AGUARDANDO', 'profit': 0, 'entry_time': self._now(), 'exit_time': self._now(), 'amount': amount, 'strategy': self.config.get('strategy'), 'assertiveness': signal_data.get('assertiveness'), 'expiration': expiration}
+        self.signals.append(signal)
+        order = self.paper.submit(pair, dict(signal_data, amount=amount, expiration=expiration), self.payouts, on_update=lambda order: self._on_paper_update(signal, order))
+        if order is None: signal['status'] = 'CANCELADO'
+        self._schedule(0, self.update_signals_ui)
+
+    def _on_paper_update(self, signal, order):
+        signal['entry_price'] = order['entry_price']; signal['status'] = order['status']
+        if order['status'] == 'ABERTA': self.risk.count_operation() # Só ordens preenchidas contam; canceladas por gap ou falta de velas não
+        if order['status'] in ('WIN', 'LOSS'):
+            signal['profit'] = order['profit']; signal['exit_time'] = self._now(); self.risk.record_simulated(order['profit'])
+            logger.info(f"Resultado {signal['id']}: {signal['status']} | Lucro: ${signal['profit']:.2f} (simulado)")
+            self._schedule(0, self.update_dashboard_ui)
+        self._schedule(0, self.update_signals_ui)
 
     def create_dashboard_tab(self, tab):
         tab.grid_columnconfigure(0, weight=3); tab.grid_columnconfigure(1, weight=1); tab.grid_rowconfigure(1, weight=1)
@@ -476,8 +698,10 @@ class SinalizadorAlphaReal:
         progress_bar = ctk.CTkProgressBar(frame, progress_color=color); progress_bar.set(0); progress_bar.pack(fill="x", pady=(5,0)); return progress_bar
 
     def update_dashboard_ui(self):
-        self.saldo_label.configure(text=f"${self.balance:.2f}"); self.lucro_label.configure(text=f"${self.total_profit:+.2f}")
         accuracy = (self.total_wins / self.total_operations * 100) if self.total_operations > 0 else 0
+        self._notify({'dashboard': {'balance': self.balance, 'profit': self.total_profit, 'accuracy': accuracy, 'wins': self.total_wins, 'losses': self.total_losses}})
+        if self.root is None: return
+        self.saldo_label.configure(text=f"${self.balance:.2f}"); self.lucro_label.configure(text=f"${self.total_profit:+.2f}")
         self.acerto_label.configure(text=f"{accuracy:.1f}%"); self.operacoes_label.configure(text=f"{self.total_wins}W / {self.total_losses}L")
         stop_win_value = self.config.get('stop_win', 100.0); stop_loss_value = self.config.get('stop_loss', 50.0)
         for widget in self.stop_win_progress.master.winfo_children():
@@ -497,38 +721,63 @@ class SinalizadorAlphaReal:
         self.signals_scroll_frame = ctk.CTkScrollableFrame(tab, fg_color="transparent"); self.signals_scroll_frame.pack(fill="both", expand=True, padx=10)
 
     def update_signals_ui(self):
-        for widget in self.signals_scroll_frame.winfo_children(): widget.destroy()
-        if not self.signals: ctk.CTkLabel(self.signals_scroll_frame, text="Aguardando novos sinais...", font=ctk.CTkFont(size=16), text_color=self.colors['text_secondary']).pack(expand=True, padx=20, pady=20); return
-        for signal in reversed(self.signals[-50:]):
-            card = ctk.CTkFrame(self.signals_scroll_frame, fg_color=self.colors['card'], corner_radius=10); card.pack(fill="x", pady=8, padx=5)
-            header_frame = ctk.CTkFrame(card, fg_color="transparent"); header_frame.pack(fill="x", padx=15, pady=(10, 5)); header_frame.grid_columnconfigure((0,1), weight=1)
-            pair_info_frame = ctk.CTkFrame(header_frame, fg_color="transparent"); pair_info_frame.grid(row=0, column=0, sticky="w")
-            direction_icon = "📈" if signal['direction'] == 'call' else "📉"
-            ctk.CTkLabel(pair_info_frame, text=direction_icon, font=ctk.CTkFont(size=18)).pack(side="left", padx=(0, 5)); ctk.CTkLabel(pair_info_frame, text=signal['pair'], font=ctk.CTkFont(size=18, weight="bold")).pack(side="left"); ctk.CTkLabel(pair_info_frame, text=signal['entry_time'].strftime('%d/%m/%Y, %H:%M:%S'), font=ctk.CTkFont(size=12), text_color=self.colors['text_secondary']).pack(side="left", padx=10)
-            status = signal.get('status', 'AGUARDANDO'); status_color = self.colors['green'] if status == 'WIN' else self.colors['red'] if status == 'LOSS' else "#64748B"; status_text = status.upper()
-            status_badge_frame = ctk.CTkFrame(header_frame, fg_color="transparent"); status_badge_frame.grid(row=0, column=1, sticky="e")
-            status_badge = ctk.CTkFrame(status_badge_frame, fg_color=status_color, corner_radius=5); status_badge.pack(); ctk.CTkLabel(status_badge, text=status_text, font=ctk.CTkFont(size=12, weight="bold"), text_color="#FFFFFF").pack(padx=10, pady=3)
-            ctk.CTkFrame(card, height=1, fg_color=self.colors['bg_secondary']).pack(fill="x", padx=15, pady=5)
-            body_frame = ctk.CTkFrame(card, fg_color="transparent"); body_frame.pack(fill="x", expand=True, padx=15, pady=5)
-            def create_info_item(parent, text_title, text_value):
-                item_frame = ctk.CTkFrame(parent, fg_color="transparent"); ctk.CTkLabel(item_frame, text=text_title, font=ctk.CTkFont(size=12), text_color=self.colors['text_secondary']).pack(side="left", padx=(0, 5)); ctk.CTkLabel(item_frame, text=text_value, font=ctk.CTkFont(size=14, weight="bold")).pack(side="left"); return item_frame
-            create_info_item(body_frame, "Direção:", signal['direction'].upper()).pack(side="left", expand=True, anchor="w")
-            assertiveness = signal.get('assertiveness')
-            assertiveness_value = f"{assertiveness}%" if isinstance(assertiveness, (int, float)) else assertiveness
-            create_info_item(body_frame, "Assertividade:", assertiveness_value).pack(side="left", expand=True, anchor="w")
-            entry_price_text = f"${signal.get('entry_price', 0.0):.5f}" if signal.get('entry_price') else "N/A"
-            create_info_item(body_frame, "Entrada:", entry_price_text).pack(side="left", expand=True, anchor="w"); create_info_item(body_frame, "Valor:", f"${signal.get('amount', 0.0):.2f}").pack(side="left", expand=True, anchor="w")
-            if status in ['WIN', 'LOSS']:
-                result_frame = ctk.CTkFrame(card, fg_color="transparent"); result_frame.pack(fill="x", padx=15, pady=(0, 10)); result_frame.grid_columnconfigure(0, weight=1)
-                ctk.CTkLabel(result_frame, text="Resultado:", font=ctk.CTkFont(size=14)).grid(row=0, column=0, sticky="w")
-                profit_color = self.colors['green'] if status == 'WIN' else self.colors['red']; profit_text = f"+${signal['profit']:.2f}" if status == 'WIN' else f"${signal['profit']:.2f}"
-                ctk.CTkLabel(result_frame, text=profit_text, font=ctk.CTkFont(size=16, weight="bold"), text_color=profit_color).grid(row=0, column=1, sticky="e")
+        """ Cria só os cartões novos, refaz os que mudaram e destrói os que saíram (em vez de recriar todos a cada evento) """
+        if self.root is None: return
+        visible = list(self.signals)[-SIGNAL_CARDS_SHOWN:]; visible_ids = {signal['id'] for signal in visible}
+        for signal_id in [i for i in self._signal_cards if i not in visible_ids]: self._signal_cards.pop(signal_id)[0].destroy()
+        if not visible:
+            if self._signals_placeholder is None: self._signals_placeholder = ctk.CTkLabel(self.signals_scroll_frame, text="Aguardando novos sinais...", font=ctk.CTkFont(size=16), text_color=self.colors['text_secondary']); self._signals_placeholder.pack(expand=True, padx=20, pady=20)
+            return
+        if self._signals_placeholder is not None: self._signals_placeholder.destroy(); self._signals_placeholder = None
+        above = None  # Mais recente no topo
+        for signal in reversed(visible):
+            state = (signal.get('status'), signal.get('entry_price'), signal.get('amount'), signal.get('profit'), signal.get('assertiveness'))
+            card, rendered = self._signal_cards.get(signal['id'], (None, None))
+            if card is not None and rendered == state: above = card; continue
+            new_card = self._create_signal_card(signal)
+            if above is not None: new_card.pack(fill="x", pady=8, padx=5, after=above)
+            elif card is not None: new_card.pack(fill="x", pady=8, padx=5, before=card)
+            else:
+                cards = self.signals_scroll_frame.pack_slaves()
+                new_card.pack(fill="x", pady=8, padx=5, **({'before': cards[0]} if cards else {}))
+            if card is not None: card.destroy()
+            self._signal_cards[signal['id']] = (new_card, state); above = new_card
+
+    def _create_signal_card(self, signal):
+        card = ctk.CTkFrame(self.signals_scroll_frame, fg_color=self.colors['card'], corner_radius=10)
+        header_frame = ctk.CTkFrame(card, fg_color="transparent"); header_frame.pack(fill="x", padx=15, pady=(10, 5)); header_frame.grid_columnconfigure((0,1), weight=1)
+        pair_info_frame = ctk.CTkFrame(header_frame, fg_color="transparent"); pair_info_frame.grid(row=0, column=0, sticky="w")
+        direction_icon = "📈" if signal['direction'] == 'call' else "📉"
+        ctk.CTkLabel(pair_info_frame, text=direction_icon, font=ctk.CTkFont(size=18)).pack(side="left", padx=(0, 5)); ctk.CTkLabel(pair_info_frame, text=signal['pair'], font=ctk.CTkFont(size=18, weight="bold")).pack(side="left"); ctk.CTkLabel(pair_info_frame, text=signal['entry_time'].strftime('%d/%m/%Y, %H:%M:%S'), font=ctk.CTkFont(size=12), text_color=self.colors['text_secondary']).pack(side="left", padx=10)
+        status = signal.get('status', 'AGUARDANDO'); status_color = self.colors['green'] if status == 'WIN' else self.colors['red'] if status == 'LOSS' else "#64748B"; status_text = status.upper()
+        status_badge_frame = ctk.CTkFrame(header_frame, fg_color="transparent"); status_badge_frame.grid(row=0, column=1, sticky="e")
+        status_badge = ctk.CTkFrame(status_badge_frame, fg_color=status_color, corner_radius=5); status_badge.pack(); ctk.CTkLabel(status_badge, text=status_text, font=ctk.CTkFont(size=12, weight="bold"), text_color="#FFFFFF").pack(padx=10, pady=3)
+        ctk.CTkFrame(card, height=1, fg_color=self.colors['bg_secondary']).pack(fill="x", padx=15, pady=5)
+        body_frame = ctk.CTkFrame(card, fg_color="transparent"); body_frame.pack(fill="x", expand=True, padx=15, pady=5)
+        def create_info_item(parent, text_title, text_value):
+            item_frame = ctk.CTkFrame(parent, fg_color="transparent"); ctk.CTkLabel(item_frame, text=text_title, font=ctk.CTkFont(size=12), text_color=self.colors['text_secondary']).pack(side="left", padx=(0, 5)); ctk.CTkLabel(item_frame, text=text_value, font=ctk.CTkFont(size=14, weight="bold")).pack(side="left"); return item_frame
+        create_info_item(body_frame, "Direção:", signal['direction'].upper()).pack(side="left", expand=True, anchor="w")
+        assertiveness = signal.get('assertiveness')
+        assertiveness_value = f"{assertiveness}%" if isinstance(assertiveness, (int, float)) else assertiveness
+        create_info_item(body_frame, "Assertividade:", assertiveness_value).pack(side="left", expand=True, anchor="w")
+        entry_price_text = f"${signal.get('entry_price', 0.0):.5f}" if signal.get('entry_price') else "N/A"
+        create_info_item(body_frame, "Entrada:", entry_price_text).pack(side="left", expand=True, anchor="w"); create_info_item(body_frame, "Valor:", f"${signal.get('amount', 0.0):.2f}").pack(side="left", expand=True, anchor="w")
+        if status in ['WIN', 'LOSS']:
+            result_frame = ctk.CTkFrame(card, fg_color="transparent"); result_frame.pack(fill="x", padx=15, pady=(0, 10)); result_frame.grid_columnconfigure(0, weight=1)
+            ctk.CTkLabel(result_frame, text="Resultado:", font=ctk.CTkFont(size=14)).grid(row=0, column=0, sticky="w")
+            profit_color = self.colors['green'] if status == 'WIN' else self.colors['red']; profit_text = f"+${signal['profit']:.2f}" if status == 'WIN' else f"${signal['profit']:.2f}"
+            ctk.CTkLabel(result_frame, text=profit_text, font=ctk.CTkFont(size=16, weight="bold"), text_color=profit_color).grid(row=0, column=1, sticky="e")
+        return card
 
     def create_pairs_tab(self, tab):
         ctk.CTkLabel(tab, text="Pares de Moedas OTC", font=ctk.CTkFont(size=18, weight="bold")).pack(pady=10)
         self.pairs_scroll_frame = ctk.CTkScrollableFrame(tab, fg_color="transparent"); self.pairs_scroll_frame.pack(fill="both", expand=True, padx=10)
 
     def update_pairs_ui(self):
+        if self.root is None: return
+        rendered = (tuple(self.available_otc_pairs), tuple(sorted(self.payouts.items())), self.min_payout)
+        if rendered == self._pairs_rendered: return  # Catálogo igual ao já exibido: não recria os cartões
+        self._pairs_rendered = rendered
         for widget in self.pairs_scroll_frame.winfo_children(): widget.destroy()
         self.pairs_scroll_frame.grid_columnconfigure(tuple(range(4)), weight=1); row, col = 0, 0
         sorted_pairs = sorted(self.available_otc_pairs, key=lambda p: self.payouts.get(p, 0), reverse=True)
@@ -540,6 +789,8 @@ class SinalizadorAlphaReal:
             if col > 3: col = 0; row += 1
 
     def update_pairs_ui_with_message(self, message):
+        if self.root is None: logger.info(message); return
+        self._pairs_rendered = None
         for widget in self.pairs_scroll_frame.winfo_children(): widget.destroy()
         ctk.CTkLabel(self.pairs_scroll_frame, text=message, font=ctk.CTkFont(size=16), text_color=self.colors['text_secondary'], wraplength=500).pack(expand=True, padx=20, pady=20)
 
@@ -550,15 +801,19 @@ class SinalizadorAlphaReal:
 
     def _connect_worker(self, email, password):
         try:
-            self.exnova_api = Exnova(email, password); status, reason = self.exnova_api.connect()
-            if status: self.root.after(0, self.update_connection_success)
-            else: self.root.after(0, lambda: self.update_connection_failed(reason))
-        except Exception as e: logger.error(f"Exceção na conexão: {e}"); self.root.after(0, lambda: self.update_connection_failed(str(e)))
+            if Exnova is None: raise ImportError("A biblioteca da API (exnovaapi) não foi encontrada. Execute o 'EXECUTAR_BOT.py' (opção 1).")
+            self.exnova_api = Exnova(email, password)
+            if self.config.get('record_session'): # Grava as respostas brutas da API para reproduzir a sessão depois (replay.py)
+                self.exnova_api = SessionRecorder(self.exnova_api, self.config['record_session']); logger.info(f"Gravando a sessão em {self.config['record_session']}.")
+            status, reason = self.exnova_api.connect()
+            if status: self._schedule(0, self.update_connection_success)
+            else: self._schedule(0, lambda: self.update_connection_failed(reason))
+        except Exception as e: logger.error(f"Exceção na conexão: {e}"); self._schedule(0, lambda: self.update_connection_failed(str(e)))
 
     def _update_asset_data(self):
         try:
             logger.info("Iniciando a busca por pares de moedas OTC..."); all_assets = self.exnova_api.get_all_init_v2(); temp_pairs = []; temp_payouts = {}
-            if not all_assets: logger.warning("API get_all_init_v2() retornou vazio."); self.root.after(0, lambda: self.update_pairs_ui_with_message("Não foi possível carregar os pares (resposta vazia da API).")); return
+            if not all_assets: logger.warning("API get_all_init_v2() retornou vazio."); self._schedule(0, lambda: self.update_pairs_ui_with_message("Não foi possível carregar os pares (resposta vazia da API).")); return
             for asset_type in ['binary', 'turbo']:
                 if asset_type in all_assets and 'actives' in all_assets[asset_type] and all_assets[asset_type]['actives']:
                     for asset_data in all_assets[asset_type]['actives'].values():
@@ -568,79 +823,93 @@ class SinalizadorAlphaReal:
                                 if name not in temp_pairs: temp_pairs.append(name)
                                 payout = 100 - asset_data.get('option', {}).get('profit', {}).get('commission', 100); temp_payouts[name] = int(payout)
             self.available_otc_pairs = sorted(temp_pairs); self.payouts = temp_payouts
-            if not self.available_otc_pairs: logger.warning("Nenhum par OTC aberto."); self.root.after(0, lambda: self.update_pairs_ui_with_message("Nenhum par OTC encontrado aberto no momento."))
-            else: logger.info(f"Encontrados {len(self.available_otc_pairs)} pares OTC."); self.root.after(0, self.update_pairs_ui)
-        except Exception as e: logger.error(f"Erro CRÍTICO ao atualizar ativos: {e}", exc_info=True); self.root.after(0, lambda: self.update_pairs_ui_with_message(f"Erro ao carregar pares. Verifique o log."))
+            if self.available_otc_pairs: self._save_asset_cache()
+            if not self.available_otc_pairs: logger.warning("Nenhum par OTC aberto."); self._schedule(0, lambda: self.update_pairs_ui_with_message("Nenhum par OTC encontrado aberto no momento."))
+            else: logger.info(f"Encontrados {len(self.available_otc_pairs)} pares OTC."); self._schedule(0, self.update_pairs_ui)
+        except Exception as e: logger.error(f"Erro CRÍTICO ao atualizar ativos: {e}", exc_info=True); self._schedule(0, lambda: self.update_pairs_ui_with_message(f"Erro ao carregar pares. Verifique o log."))
+
+    def _load_asset_cache(self):
+        """ Carrega o último catálogo salvo para a primeira varredura não esperar o get_all_init_v2() """
+        if self.available_otc_pairs or not self.asset_cache_file: return
+        try:
+            with open(self.asset_cache_file, 'r', encoding='utf-8') as f: cache = json.load(f)
+            age = time.time() - cache.get('saved_at', 0)
+            if age > float(self.config.get('asset_cache_max_age', 86400)): logger.info("Cache de pares expirado; aguardando a API."); return
+            self.available_otc_pairs = list(cache['pairs']); self.payouts = {k: int(v) for k, v in cache['payouts'].items()}
+            logger.info(f"{len(self.available_otc_pairs)} pares OTC carregados do cache ({age / 60:.0f} min). Atualizando em segundo plano...")
+            self._schedule(0, self.update_pairs_ui)
+        except FileNotFoundError: pass
+        except (OSError, ValueError, KeyError, TypeError) as e: logger.warning(f"Cache de pares inválido: {e}")
+
+    def _save_asset_cache(self):
+        if not self.asset_cache_file: return
+        try:
+            with open(self.asset_cache_file, 'w', encoding='utf-8') as f: json.dump({'saved_at': time.time(), 'pairs': self.available_otc_pairs, 'payouts': self.payouts}, f)
+        except OSError as e: logger.warning(f"Não foi possível salvar o cache de pares: {e}")
 
     def update_connection_success(self):
-        self.connected = True; self.connect_btn.pack_forget(); self.trading_btn.pack(fill="x", expand=True)
-        self.conexao_label.configure(text=f"Conexão: Conectado", text_color=self.colors['green'])
-        account_type = self.ui_vars['account_type'].get(); self.exnova_api.change_balance(account_type)
-        self.balance = self.exnova_api.get_balance(); self.conta_label.configure(text=f"Conta: {account_type}")
-        self.update_dashboard_ui(); messagebox.showinfo("Sucesso", f"Conectado!\nSaldo: ${self.balance:.2f}")
+        self.connected = True
+        account_type = self.ui_vars['account_type'].get() if self.root else self.config.get('account_type', 'PRACTICE'); self.exnova_api.change_balance(account_type)
+        self.balance = self.exnova_api.get_balance()
+        self._load_asset_cache() # Pares do cache já liberam a varredura; o catálogo real chega em segundo plano
         threading.Thread(target=self._update_asset_data, daemon=True).start()
+        for executor in self.executors: threading.Thread(target=executor.connect, daemon=True).start()
+        self._notify({'connection_status': 'success', 'account_type': account_type}); self.update_dashboard_ui()
+        if self.root is None: logger.info(f"Conectado! Saldo: ${self.balance:.2f}"); return
+        self.connect_btn.pack_forget(); self.trading_btn.pack(fill="x", expand=True)
+        self.conexao_label.configure(text=f"Conexão: Conectado", text_color=self.colors['green']); self.conta_label.configure(text=f"Conta: {account_type}")
+        messagebox.showinfo("Sucesso", f"Conectado!\nSaldo: ${self.balance:.2f}")
 
     def update_connection_failed(self, reason):
-        self.connected = False; self.connect_btn.configure(text="🔗 Conectar", state="normal"); self.conexao_label.configure(text="Conexão: Desconectado", text_color=self.colors['red'])
+        self.connected = False; self._notify({'connection_status': 'failed'})
+        if self.root is None: logger.error(f"Falha ao conectar: {reason or 'Verifique suas credenciais.'}"); return
+        self.connect_btn.configure(text="🔗 Conectar", state="normal"); self.conexao_label.configure(text="Conexão: Desconectado", text_color=self.colors['red'])
         messagebox.showerror("Erro de Conexão", f"Falha ao conectar: {reason or 'Verifique suas credenciais.'}")
 
     def toggle_real_trading(self):
-        if not self.connected: messagebox.showerror("Erro", "Conecte-se primeiro!"); return
-        if not self.available_otc_pairs: messagebox.showwarning("Aviso", "Nenhum par de moeda foi carregado. Não é possível iniciar."); return
+        if not self.connected: self._alert("Erro", "Conecte-se primeiro!"); return
+        if not self.available_otc_pairs: self._alert("Aviso", "Nenhum par de moeda foi carregado. Não é possível iniciar.", 'warning'); return
         self.trading = not self.trading
-        if self.trading: self.save_real_config(); self.trading_btn.pack_forget(); self.parar_trading_btn.pack(fill="x", expand=True); self.trading_label.configure(text=f"Trading: Ativo ({self.config['operation_mode']})", text_color=self.colors['green'])
+        status = f"Ativo ({self.config['operation_mode']})" if self.trading else "Parado"
+        self._notify({'trading_status': status})
+        if self.root is None: logger.info(f"Trading: {status}"); return
+        if self.trading: self.save_real_config(); self.trading_btn.pack_forget(); self.parar_trading_btn.pack(fill="x", expand=True); self.trading_label.configure(text=f"Trading: {status}", text_color=self.colors['green'])
         else: self.parar_trading_btn.pack_forget(); self.trading_btn.pack(fill="x", expand=True); self.trading_label.configure(text="Trading: Parado", text_color=self.colors['text_secondary'])
 
-    def _get_current_price(self, pair):
-        try:
-            candles = self.exnova_api.get_candles(pair, 60, 1, time.time())
-            if candles: return candles[0]['close'], candles[0]['open']
-        except Exception as e: logger.error(f"Falha ao obter preço atual para {pair}: {e}")
-        return None, None
-    
-    def check_trade_result(self, order_id, amount, signal_id, is_catalog=False, **kwargs):
+    def check_trade_result(self, order_id, amount, signal, risk_ticket=None):
+        """ Liquida a ordem pelo order_id/risk_ticket; signal é o próprio registro do trade, mesmo que já tenha saído de self.signals """
         try:
-            signal = next((s for s in self.signals if s['id'] == signal_id), None)
-            if not signal: return
-            
             win_amount = 0
-            if not is_catalog:
-                result = self.exnova_api.check_win_v4(order_id)
-                if isinstance(result, (tuple, list)) and len(result) > 0:
-                    numeric_results = [val for val in result if isinstance(val, (int, float))]; win_amount = numeric_results[0] if numeric_results else 0
-                elif isinstance(result, (int, float)): win_amount = result
-            else: # Lógica para modo 'Analisar'
-                final_price_candles = self.exnova_api.get_candles(kwargs['pair'], 60, 1, time.time())
-                if final_price_candles:
-                    final_price = final_price_candles[0]['close']; entry_price = kwargs['entry_price']; direction = kwargs['direction']
-                    if (direction == 'call' and final_price > entry_price) or (direction == 'put' and final_price < entry_price):
-                        payout_percent = self.payouts.get(kwargs['pair'], self.min_payout) / 100.0; win_amount = amount * payout_percent
+            result = self.exnova_api.check_win_v4(order_id)
+            if isinstance(result, (tuple, list)) and len(result) > 0:
+                numeric_results = [val for val in result if isinstance(val, (int, float))]; win_amount = numeric_results[0] if numeric_results else 0
+            elif isinstance(result, (int, float)): win_amount = result
             
-            signal['exit_time'] = datetime.now()
+            signal['exit_time'] = self._now()
             if win_amount > 0: # WIN
-                profit = win_amount if not is_catalog else (amount * (self.payouts.get(signal['pair'], self.min_payout) / 100.0))
-                if not is_catalog: self.total_profit += profit
-                self.total_wins += 1; signal['status'] = 'WIN'; signal['profit'] = profit
+                signal['status'] = 'WIN'; signal['profit'] = win_amount
             else: # LOSS
-                if not is_catalog: self.total_profit -= amount
-                self.total_losses += 1; signal['status'] = 'LOSS'; signal['profit'] = -amount
-                
+                signal['status'] = 'LOSS'; signal['profit'] = -amount
+            self.risk.settle(risk_ticket, signal['profit'])
+
+            if signal['status'] == 'LOSS':
                 if self.config.get('enable_martingale', False) and self.config['operation_mode'] == 'Operar':
                     logger.info(f"LOSS. Acionando Martingale para {signal['pair']}.")
                     new_amount = amount * 2
-                    martingale_data = {'signal': signal['direction'], 'pair': signal['pair'], 'amount': new_amount}
-                    threading.Thread(target=self._execute_martingale_trade, args=(martingale_data,)).start()
+                    martingale_data = {'signal': signal['direction'], 'pair': signal['pair'], 'amount': new_amount, 'expiration': signal.get('expiration')}
+                    self.tasks.schedule(1, self._execute_martingale_trade, martingale_data)
 
-            if not is_catalog: self.balance = self.exnova_api.get_balance()
+            self.balance = self.exnova_api.get_balance()
             logger.info(f"Resultado {signal['id']}: {signal['status']} | Lucro: ${signal['profit']:.2f} | Saldo Atual: ${self.balance:.2f}")
-            self.root.after(0, self.update_dashboard_ui); self.root.after(0, self.update_signals_ui)
-        except Exception as e: logger.error(f"Erro CRÍTICO ao verificar resultado do trade {order_id}: {e}", exc_info=True)
+            self._schedule(0, self.update_dashboard_ui); self._schedule(0, self.update_signals_ui)
+        except Exception as e:
+            logger.error(f"Erro CRÍTICO ao verificar resultado do trade {order_id}: {e}", exc_info=True)
+            if risk_ticket is not None: self.risk.cancel(risk_ticket) # Resultado desconhecido: libera a exposição
 
     def _execute_martingale_trade(self, trade_data):
         try:
             pair = trade_data['pair']
             logger.info(f"Verificando condições para a entrada de Martingale em {pair}...")
-            time.sleep(1) 
 
             if not self.trading:
                 logger.warning(f"MARTINGALE CANCELADO ({pair}): O trading foi parado.")
@@ -650,22 +919,18 @@ class SinalizadorAlphaReal:
                 logger.warning(f"MARTINGALE CANCELADO ({pair}): Payout baixo ({self.payouts.get(pair, 0)}%).")
                 return
 
-            if self.total_profit >= self.config.get('stop_win', float('inf')):
-                logger.warning(f"MARTINGALE CANCELADO ({pair}): Meta Stop Win atingida.")
-                self.root.after(0, self.toggle_real_trading)
-                return
-
-            if self.total_profit < 0 and abs(self.total_profit) >= self.config.get('stop_loss', float('inf')):
-                logger.warning(f"MARTINGALE CANCELADO ({pair}): Limite Stop Loss atingido.")
-                self.root.after(0, self.toggle_real_trading)
+            risk_ticket = self._reserve_risk(pair, trade_data['amount'], "MARTINGALE CANCELADO")
+            if risk_ticket is None:
                 return
             
-            self._send_trade(pair, trade_data, is_martingale=True)
+            self._send_trade(pair, trade_data, is_martingale=True, risk_ticket=risk_ticket)
         except Exception as e:
             logger.error(f"Erro CRÍTICO ao executar o Martingale para {trade_data.get('pair')}: {e}", exc_info=True)
 
     def start_background_thread(self):
-        threading.Thread(target=self.analyze_market_loop, daemon=True).start()
+        # No modo web o servidor conduz as varreduras e os trades pelo próprio loop: um único motor por sessão da API
+        if self.gui_mode != 'web': threading.Thread(target=self.analyze_market_loop, daemon=True).start()
+        self.monitor.start()  # Relatório de memória periódico no log (config['memory_report_interval'], 0 desliga)
         def asset_updater_loop():
             while True:
                 time.sleep(1800)
@@ -673,8 +938,10 @@ class SinalizadorAlphaReal:
         threading.Thread(target=asset_updater_loop, daemon=True).start()
 
     def run(self):
-        self.root.mainloop()
+        if self.root: self.root.mainloop()
 
 if __name__ == "__main__":
+    sys.modules.setdefault('SINALIZADOR_ALPHA_REAL', sys.modules[__name__]) # Plugins importam TradingStrategyReal deste módulo, não de uma segunda cópia
+    multiprocessing.freeze_support() # Processos de análise no executável do PyInstaller
     app = SinalizadorAlphaReal()
     app.run()
\ No newline at end of file
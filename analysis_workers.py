@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⚙️ SINALIZADOR ALPHA - Processos de Análise
+Distribui os pares entre processos separados para que a avaliação das
+estratégias use vários núcleos, fora do GIL da interface e das threads de
+trade. Cada processo mantém o próprio armazenamento de velas e as próprias
+instâncias de estratégia; o processo principal envia apenas as velas novas
+(um array float64 por par) e recebe de volta só os sinais.
+"""
+
+import logging
+import multiprocessing
+import zlib
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Colunas do array enviado aos processos, na ordem do formato interno do CandleStore
+CANDLE_FIELDS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+
+
+def candles_to_array(candles: list) -> np.ndarray:
+    """Compacta a resposta de get_candles (ou velas já normalizadas) num array (n, 6) float64."""
+    from candle_store import decode_candles
+    arrays = decode_candles(candles)
+    return np.column_stack([arrays[field].astype(np.float64) for field in CANDLE_FIELDS]).reshape(-1, len(CANDLE_FIELDS))
+
+
+def array_to_candles(array: np.ndarray) -> list:
+    return [dict(zip(CANDLE_FIELDS, row)) for row in array.tolist()]
+
+
+def shard_of(pair: str, workers: int) -> int:
+    """Processo responsável pelo par; estável entre execuções (o par sempre volta ao mesmo estado)."""
+    return zlib.crc32(pair.encode('utf-8')) % workers
+
+
+def _worker_main(conn, config: dict, candle_window: int):
+    """Laço de cada processo: recebe ('config', cfg), ('analyze', estratégia, [(par, velas)]) ou ('stop',)."""
+    from candle_store import CandleStore
+    from SINALIZADOR_ALPHA_REAL import create_strategy_registry, configure_logging
+    configure_logging()
+    registry = create_strategy_registry(config); strategies = registry.strategies
+    store = CandleStore(timeframes={tf for s in strategies.values() for tf in s.timeframes}, window=candle_window)
+    while True:
+        try: message = conn.recv()
+        except EOFError: return
+        if message[0] == 'stop': return
+        if message[0] == 'config':
+            if not registry.refresh(message[1]): continue
+            strategies = registry.strategies
+            for strategy in strategies.values():
+                for timeframe in strategy.timeframes: store.add_timeframe(timeframe)
+            continue
+        _, strategy_name, batch = message
+        strategy = strategies.get(strategy_name); signals = []; errors = 0
+        for pair, array in batch:
+            try:
+                store.update(pair, array_to_candles(array))
+                if strategy is None: continue
+                analysis = strategy.analyze_frames({tf: store.arrays(pair, tf, candle_window) for tf in strategy.timeframes})
+                if analysis and analysis.get('signal'): signals.append((pair, analysis))
+            except Exception as e:
+                errors += 1; logger.error(f"Erro ao analisar {pair} no processo de análise: {e}")
+        conn.send((signals, errors))
+
+
+class AnalysisPool:
+    """Processos de análise com os pares divididos por hash; analyze() roda todos em paralelo."""
+
+    def __init__(self, workers: int, config: dict, candle_window: int = 100, timeout: float = 30.0):
+        self.workers = max(1, int(workers))
+        self.timeout = timeout
+        self._config = dict(config); self._candle_window = candle_window
+        # spawn em todas as plataformas: é o padrão no Windows e evita fork com as threads do bot já rodando
+        self._context = multiprocessing.get_context('spawn')
+        self._procs = [None] * self.workers; self._conns = [None] * self.workers
+        self._synced = [set() for _ in range(self.workers)]  # Pares cujo histórico completo o processo já recebeu
+        for index in range(self.workers): self._start(index)
+        logger.info(f"{self.workers} processos de análise iniciados.")
+
+    def _start(self, index):
+        parent, child = self._context.Pipe()
+        process = self._context.Process(target=_worker_main, args=(child, self._config, self._candle_window), daemon=True, name=f"analise-{index + 1}")
+        process.start(); child.close()
+        self._synced[index] = set()
+        self._procs[index] = process; self._conns[index] = parent
+
+    def set_config(self, config: dict):
+        """Atualiza parâmetros e plugins das estratégias nos processos (as velas em memória são mantidas)."""
+        self._config = dict(config)
+        for conn in self._conns:
+            try: conn.send(('config', self._config))
+            except (OSError, ValueError): pass
+
+    def analyze(self, strategy_name: str, batch: list, history=None) -> list:
+        """
+        batch: [(par, velas novas da API)]. history(par) devolve o histórico completo do par
+        (CandleStore do processo principal), enviado uma única vez para cada processo.
+        Retorna [(par, análise)] apenas dos pares com sinal.
+        """
+        for index, process in enumerate(self._procs):
+            if not process.is_alive(): logger.warning(f"Processo de análise {index + 1} parou; reiniciando."); self._start(index)
+        shards = [[] for _ in range(self.workers)]
+        for pair, candles in batch:
+            index = shard_of(pair, self.workers)
+            if history is not None and pair not in self._synced[index]: candles = history(pair); self._synced[index].add(pair)
+            shards[index].append((pair, candles_to_array(candles)))
+        pending = []
+        for index, shard in enumerate(shards):
+            if not shard: continue
+            self._conns[index].send(('analyze', strategy_name, shard)); pending.append(index)
+        signals = []
+        for index in pending:
+            conn = self._conns[index]
+            if not conn.poll(self.timeout):
+                logger.error(f"Processo de análise {index + 1} não respondeu em {self.timeout:.0f}s; reiniciando.")
+                self._procs[index].terminate(); self._start(index); continue
+            shard_signals, errors = conn.recv()
+            signals.extend(shard_signals)
+            if errors: logger.warning(f"Processo de análise {index + 1}: {errors} pares com erro nesta varredura.")
+        return signals
+
+    def close(self):
+        for index, conn in enumerate(self._conns):
+            try: conn.send(('stop',))
+            except (OSError, ValueError): pass
+            self._procs[index].join(timeout=2)
+            if self._procs[index].is_alive(): self._procs[index].terminate()
+            conn.close()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🕯️ SINALIZADOR ALPHA - Biblioteca de Padrões de Candle
+Cada padrão é avaliado de uma vez sobre todo o histórico OHLC e devolve uma
+máscara booleana NumPy (True na última vela do padrão). A mesma função serve
+para a checagem ao vivo (posição -2, última vela fechada) e para backtests.
+"""
+
+import numpy as np
+
+MIN_BODY = 1e-5  # Corpo mínimo usado nas proporções, evita divisão por zero
+
+
+def as_ohlc(data):
+    """Extrai open/high/low/close como arrays float64 de um DataFrame ou de qualquer mapeamento de colunas."""
+    return tuple(np.asarray(data[col], dtype=np.float64) for col in ('open', 'high', 'low', 'close'))
+
+
+def _prev(values, periods=1):
+    """Desloca a série para trás; as primeiras posições ficam NaN (comparações dão False)."""
+    shifted = np.full(values.shape, np.nan)
+    if periods < len(values): shifted[periods:] = values[:-periods]
+    return shifted
+
+
+class _Candles:
+    """Medidas derivadas calculadas uma única vez por varredura e compartilhadas entre os padrões."""
+
+    def __init__(self, o, h, l, c):
+        self.o, self.h, self.l, self.c = o, h, l, c
+        self.body = np.abs(c - o)
+        self.safe_body = np.where(self.body == 0, MIN_BODY, self.body)
+        self.range = h - l
+        self.upper = h - np.maximum(o, c)
+        self.lower = np.minimum(o, c) - l
+        self.bull = c > o
+        self.bear = c < o
+
+    def prev(self, name, periods=1):
+        return _prev(getattr(self, name), periods)
+
+    def prev_bool(self, name, periods=1):
+        return _prev(getattr(self, name).astype(np.float64), periods) == 1.0
+
+
+def bullish_engulfing(k):
+    return k.prev_bool('bear') & k.bull & (k.o < k.prev('c')) & (k.c > k.prev('o'))
+
+
+def bearish_engulfing(k):
+    return k.prev_bool('bull') & k.bear & (k.o > k.prev('c')) & (k.c < k.prev('o'))
+
+
+def hammer(k):
+    return (k.lower > 2 * k.safe_body) & (k.upper < 0.5 * k.safe_body)
+
+
+def shooting_star(k):
+    # Mesma forma do Hanging Man invertido: sombra superior longa e corpo na mínima
+    return (k.upper > 2 * k.safe_body) & (k.lower < 0.5 * k.safe_body)
+
+
+def doji(k):
+    return (k.range > 0) & (k.body <= 0.1 * k.range)
+
+
+def morning_star(k):
+    first_body = k.prev('body', 2)
+    return (k.prev_bool('bear', 2) & (k.prev('body', 1) < 0.3 * first_body) & k.bull
+            & (k.c > (k.prev('o', 2) + k.prev('c', 2)) / 2))
+
+
+def evening_star(k):
+    first_body = k.prev('body', 2)
+    return (k.prev_bool('bull', 2) & (k.prev('body', 1) < 0.3 * first_body) & k.bear
+            & (k.c < (k.prev('o', 2) + k.prev('c', 2)) / 2))
+
+
+def three_white_soldiers(k):
+    rising = k.bull & k.prev_bool('bull') & k.prev_bool('bull', 2) & (k.c > k.prev('c')) & (k.prev('c') > k.prev('c', 2))
+    opens_inside = (k.o > k.prev('o')) & (k.o <= k.prev('c')) & (k.prev('o') > k.prev('o', 2)) & (k.prev('o') <= k.prev('c', 2))
+    return rising & opens_inside
+
+
+def three_black_crows(k):
+    falling = k.bear & k.prev_bool('bear') & k.prev_bool('bear', 2) & (k.c < k.prev('c')) & (k.prev('c') < k.prev('c', 2))
+    opens_inside = (k.o < k.prev('o')) & (k.o >= k.prev('c')) & (k.prev('o') < k.prev('o', 2)) & (k.prev('o') >= k.prev('c', 2))
+    return falling & opens_inside
+
+
+# Catálogo: nome -> (função, direção sugerida, rótulo para o log, velas do padrão)
+PATTERNS = {
+    'bullish_engulfing': (bullish_engulfing, 'call', 'Bullish Engulfing', 2),
+    'bearish_engulfing': (bearish_engulfing, 'put', 'Bearish Engulfing', 2),
+    'hammer': (hammer, 'call', 'Hammer', 1),
+    'shooting_star': (shooting_star, 'put', 'Hanging Man / Shooting Star', 1),
+    'doji': (doji, None, 'Doji', 1),
+    'morning_star': (morning_star, 'call', 'Morning Star', 3),
+    'evening_star': (evening_star, 'put', 'Evening Star', 3),
+    'three_white_soldiers': (three_white_soldiers, 'call', 'Three White Soldiers', 3),
+    'three_black_crows': (three_black_crows, 'put', 'Three Black Crows', 3),
+}
+
+
+def scan(data, names=None, tail=None) -> dict:
+    """
+    Avalia os padrões pedidos (todos, por padrão) e retorna {nome: máscara}.
+    tail=N limita o cálculo às últimas N velas (mais o histórico que os padrões
+    precisam), para checagens ao vivo; sem tail, cobre todo o histórico.
+    """
+    o, h, l, c = as_ohlc(data)
+    names = list(names or PATTERNS)
+    if tail:
+        lookback = max(PATTERNS[name][3] for name in names) - 1
+        o, h, l, c = (a[-(tail + lookback):] for a in (o, h, l, c))
+    candles = _Candles(o, h, l, c)
+    masks = {name: PATTERNS[name][0](candles) for name in names}
+    if tail: masks = {name: mask[-tail:] for name, mask in masks.items()}
+    return masks
+
+
+def label(name: str) -> str:
+    return PATTERNS[name][2]
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🕯️ SINALIZADOR ALPHA - Armazenamento de Velas
+Mantém as velas de 1 minuto de cada par em memória e agrega localmente
+os timeframes maiores (5m, 15m, ...) sem nenhuma chamada extra à API.
+As estratégias recebem as velas em colunas NumPy (CandleArrays), sem pandas.
+"""
+
+import threading
+from collections import deque
+
+import numpy as np
+
+BASE_TIMEFRAME = 60  # Única resolução baixada da corretora (velas de 1 minuto)
+
+
+def normalize_candle(raw: dict) -> dict:
+    """Converte uma vela no formato da API ('from', 'max', 'min') para o formato interno."""
+    return {
+        'timestamp': int(raw.get('from', raw.get('timestamp', 0))),
+        'open': float(raw['open']),
+        'high': float(raw.get('max', raw.get('high', raw['open']))),
+        'low': float(raw.get('min', raw.get('low', raw['open']))),
+        'close': float(raw['close']),
+        'volume': float(raw.get('volume', 0) or 0),
+    }
+
+
+# Coluna -> (chaves aceitas, na ordem: formato interno e formato da API), tipo
+CANDLE_COLUMNS = {
+    'timestamp': (('timestamp', 'from'), np.int64),
+    'open': (('open',), np.float64),
+    'high': (('high', 'max'), np.float64),
+    'low': (('low', 'min'), np.float64),
+    'close': (('close',), np.float64),
+    'volume': (('volume',), np.float64),
+}
+
+
+class CandleArrays:
+    """
+    Velas em colunas NumPy (struct of arrays). data['close'] e data.close devolvem
+    arrays float64 (timestamp é int64), len(data) é o número de velas e, como na
+    API, o último item é a vela em formação. to_frame() monta um DataFrame para
+    quem ainda precisa do pandas.
+    """
+
+    __slots__ = tuple(CANDLE_COLUMNS)
+
+    def __init__(self, timestamp, open, high, low, close, volume):
+        self.timestamp = timestamp; self.open = open; self.high = high
+        self.low = low; self.close = close; self.volume = volume
+
+    def __len__(self):
+        return len(self.close)
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        if column not in CANDLE_COLUMNS: raise KeyError(column)
+        return getattr(self, column)
+
+    def __contains__(self, column):
+        return column in CANDLE_COLUMNS
+
+    @property
+    def columns(self):
+        return list(CANDLE_COLUMNS)
+
+    def to_frame(self):
+        """DataFrame com as mesmas colunas (pandas importado só aqui)."""
+        import pandas as pd
+        return pd.DataFrame({column: getattr(self, column) for column in CANDLE_COLUMNS})
+
+
+def decode_candles(raw: list) -> CandleArrays:
+    """
+    Converte a lista de velas da API ('from', 'max', 'min') ou do formato interno
+    direto em colunas tipadas, sem passar por dicionários normalizados nem DataFrame.
+    """
+    if not raw: return CandleArrays(**{column: np.empty(0, dtype=dtype) for column, (_, dtype) in CANDLE_COLUMNS.items()})
+    first = raw[0]; columns = {}
+    for column, (keys, dtype) in CANDLE_COLUMNS.items():
+        key = next((k for k in keys if k in first), None)
+        if key is None: columns[column] = np.zeros(len(raw), dtype=dtype) if column == 'volume' else columns['open'].copy(); continue
+        values = (c[key] or 0 for c in raw) if column == 'volume' else (c[key] for c in raw)
+        columns[column] = np.fromiter(values, dtype=dtype, count=len(raw))
+    return CandleArrays(**columns)
+
+
+class CandleStore:
+    """
+    Armazena as velas de 1m por par e mantém barras de timeframes maiores
+    atualizadas de forma incremental, a cada vela de 1m que fecha.
+
+    Convenção igual à da API: o último item de cada série é a vela/barra em
+    formação e o penúltimo é a última fechada (por isso as estratégias leem [-2]).
+    """
+
+    def __init__(self, timeframes=(), maxlen: int = 300, window: int = 100):
+        self.maxlen = maxlen  # Barras mantidas por timeframe
+        self.window = window  # Barras do maior timeframe que as velas de 1m guardadas precisam reconstruir
+        self.timeframes = []
+        self._lock = threading.RLock()
+        self._closed = {}   # par -> deque de velas de 1m fechadas
+        self._live = {}     # par -> vela de 1m em formação
+        self._bars = {}     # (par, timeframe) -> deque de barras fechadas
+        self._forming = {}  # (par, timeframe) -> barra em formação
+        for timeframe in timeframes: self.add_timeframe(timeframe)
+
+    def add_timeframe(self, timeframe: int):
+        """Registra um novo timeframe e o reconstrói a partir das velas de 1m já armazenadas."""
+        timeframe = int(timeframe)
+        if timeframe <= BASE_TIMEFRAME or timeframe % BASE_TIMEFRAME != 0:
+            if timeframe != BASE_TIMEFRAME: raise ValueError(f"Timeframe inválido: {timeframe}s (deve ser múltiplo de {BASE_TIMEFRAME}s)")
+            return
+        with self._lock:
+            if timeframe in self.timeframes: return
+            self.timeframes.append(timeframe); self.timeframes.sort()
+            base_maxlen = self._base_maxlen()
+            for pair, closed in self._closed.items():
+                if closed.maxlen < base_maxlen: closed = self._closed[pair] = deque(closed, maxlen=base_maxlen)
+                for candle in closed: self._aggregate(pair, timeframe, candle)
+                self._roll_forming(pair, timeframe)
+
+    def history_length(self, count: int) -> int:
+        """Velas de 1m para count barras completas do maior timeframe (mais a barra em formação e a incompleta do início)."""
+        ratio = max(self.timeframes, default=BASE_TIMEFRAME) // BASE_TIMEFRAME
+        return (count + 2) * ratio - 2 if ratio > 1 else count
+
+    def _base_maxlen(self):
+        return max(self.maxlen, self.history_length(self.window))
+
+    def fetch_count(self, pair: str, now: float, default: int) -> int:
+        """Quantas velas pedir à API: o histórico completo na primeira vez, depois só o que falta."""
+        with self._lock:
+            closed = self._closed.get(pair)
+            if not closed: return default
+            missing = int((now - closed[-1]['timestamp']) // BASE_TIMEFRAME) + 1
+        return max(2, min(default, missing))
+
+    def update(self, pair: str, raw_candles: list) -> int:
+        """Incorpora a resposta de get_candles. Retorna quantas velas de 1m novas fecharam."""
+        candles = sorted((normalize_candle(c) for c in raw_candles), key=lambda c: c['timestamp'])
+        if not candles: return 0
+        new_closed = 0
+        with self._lock:
+            closed = self._closed.setdefault(pair, deque(maxlen=self._base_maxlen()))
+            last_ts = closed[-1]['timestamp'] if closed else None
+            for candle in candles[:-1]:
+                if last_ts is not None and candle['timestamp'] <= last_ts: continue
+                closed.append(candle); last_ts = candle['timestamp']; new_closed += 1
+                for timeframe in self.timeframes: self._aggregate(pair, timeframe, candle)
+            self._live[pair] = candles[-1]
+            for timeframe in self.timeframes: self._roll_forming(pair, timeframe)
+        return new_closed
+
+    def _aggregate(self, pair, timeframe, candle):
+        key = (pair, timeframe)
+        bucket = candle['timestamp'] - candle['timestamp'] % timeframe
+        bar = self._forming.get(key)
+        # Barra aberta pela vela em formação (_seeded): a primeira vela fechada do período a substitui
+        seeded = bar is not None and bar.get('_seeded', False)
+        if bar is not None and not seeded and bar['timestamp'] == bucket:
+            bar['high'] = max(bar['high'], candle['high']); bar['low'] = min(bar['low'], candle['low'])
+            bar['close'] = candle['close']; bar['volume'] += candle['volume']
+            return
+        if bar is not None and not seeded: self._close_bar(key, bar)
+        self._forming[key] = dict(candle, timestamp=bucket, _complete=candle['timestamp'] == bucket)
+
+    def _roll_forming(self, pair, timeframe):
+        """
+        Fecha a barra maior assim que a vela de 1m em formação já pertence ao próximo
+        período e abre a seguinte com ela, para o último item ser sempre a barra em formação.
+        """
+        key = (pair, timeframe); bar = self._forming.get(key); live = self._live.get(pair)
+        if live is None: return
+        bucket = live['timestamp'] - live['timestamp'] % timeframe
+        if bar is not None and not bar.get('_seeded', False):
+            if bar['timestamp'] >= bucket: return
+            self._close_bar(key, bar)
+        self._forming[key] = dict(live, timestamp=bucket, _complete=live['timestamp'] == bucket, _seeded=True)
+
+    def _close_bar(self, key, bar):
+        # Barras que começaram no meio do período (início do histórico) são descartadas
+        if not bar.pop('_complete', True): return
+        self._bars.setdefault(key, deque(maxlen=self.maxlen)).append(bar)
+
+    def candles(self, pair: str, timeframe: int = BASE_TIMEFRAME, count: int = None) -> list:
+        """Barras fechadas seguidas da barra em formação (cópias), no formato interno."""
+        with self._lock:
+            if timeframe == BASE_TIMEFRAME:
+                closed = self._closed.get(pair, ()); forming = self._live.get(pair)
+            else:
+                closed = self._bars.get((pair, timeframe), ()); forming = self._forming.get((pair, timeframe))
+            if count: closed = list(closed)[-count:]
+            series = [dict(c) for c in closed]
+            if forming is not None: series.append({k: v for k, v in forming.items() if not k.startswith('_')})
+        return series[-count:] if count else series
+
+    def candle_at(self, pair: str, timestamp: int):
+        """Vela de 1m que começa em timestamp: (cópia, fechada?) ou (None, False) se ainda não foi baixada."""
+        with self._lock:
+            live = self._live.get(pair)
+            if live is not None and live['timestamp'] == timestamp: return dict(live), False
+            for candle in reversed(self._closed.get(pair, ())):
+                if candle['timestamp'] == timestamp: return dict(candle), True
+                if candle['timestamp'] < timestamp: break
+        return None, False
+
+    def arrays(self, pair: str, timeframe: int = BASE_TIMEFRAME, count: int = None) -> CandleArrays:
+        """Mesmas velas de candles(), já em colunas NumPy para as estratégias."""
+        return decode_candles(self.candles(pair, timeframe, count))
+
+    def volatility(self, pair: str, window: int = 20) -> float:
+        """Amplitude média (high - low) das últimas velas fechadas de 1m, em % do preço."""
+        with self._lock: closed = list(self._closed.get(pair, ()))[-window:]
+        ranges = [(c['high'] - c['low']) / c['close'] * 100 for c in closed if c['close']]
+        return sum(ranges) / len(ranges) if ranges else 0.0
+
+    def pairs(self) -> list:
+        with self._lock: return list(self._closed.keys())
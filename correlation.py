@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🔗 SINALIZADOR ALPHA - Correlação entre Pares
+Mantém os retornos de 1m de todos os pares numa janela móvel indexada pelo
+minuto de cada vela, com a correlação calculada de forma vetorizada só sobre
+os minutos em que os dois pares têm retorno. Sinais de pares correlacionados
+no mesmo minuto são agrupados e só o melhor de cada grupo segue adiante.
+"""
+
+import threading
+
+import numpy as np
+
+
+class ReturnCorrelation:
+    """Correlação móvel dos retornos de 1m entre todos os pares observados."""
+
+    def __init__(self, window: int = 60, min_rows: int = 15, period: int = 60):
+        self.window = window                # Minutos na janela móvel
+        self.min_rows = min_rows            # Minutos em comum abaixo dos quais a correlação do par não é usada
+        self.period = period                # Duração da vela (s)
+        self._lock = threading.Lock()
+        self._index = {}                              # par -> coluna
+        self._rows = np.full((window, 0), np.nan)     # Buffer circular: linha = minuto da vela, NaN = retorno ausente
+        self._row_ts = np.full(window, -1, dtype=np.int64)  # Minuto (timestamp) guardado em cada linha
+        self._last_closed = {}              # par -> (timestamp, close) da última vela vista
+        self._latest_ts = -1
+
+    def _column(self, pair):
+        col = self._index.get(pair)
+        if col is None:
+            col = self._index[pair] = len(self._index)
+            self._rows = np.hstack([self._rows, np.full((self.window, 1), np.nan)])
+        return col
+
+    def observe(self, pair: str, closed_candles: list):
+        """
+        Registra velas de 1m fechadas (formato interno do CandleStore, em ordem). Cada retorno
+        vai para a linha do seu minuto, mesmo quando chega depois dos outros pares (histórico
+        inicial de cada par, pares varridos com menos frequência).
+        """
+        with self._lock:
+            for candle in closed_candles:
+                ts, close = int(candle['timestamp']), candle['close']
+                previous = self._last_closed.get(pair)
+                if previous is not None and ts <= previous[0]: continue
+                self._last_closed[pair] = (ts, close)
+                # Sem a vela do minuto anterior o retorno fica ausente (não vira zero)
+                if previous is None or ts - previous[0] != self.period or not previous[1]: continue
+                if ts <= self._latest_ts - self.window * self.period: continue
+                slot = ts // self.period % self.window
+                if self._row_ts[slot] > ts: continue
+                if self._row_ts[slot] < ts: self._rows[slot] = np.nan; self._row_ts[slot] = ts
+                col = self._column(pair)
+                self._rows[slot, col] = close / previous[1] - 1.0
+                self._latest_ts = max(self._latest_ts, ts)
+
+    def matrix(self, pairs: list) -> np.ndarray:
+        """Matriz de correlação entre os pares pedidos (NaN para pares com menos de min_rows minutos em comum)."""
+        with self._lock:
+            result = np.full((len(pairs), len(pairs)), np.nan)
+            cols = [self._index.get(p) for p in pairs]
+            known = [i for i, c in enumerate(cols) if c is not None]
+            if not known: return result
+            recent = self._row_ts > self._latest_ts - self.window * self.period
+            values = self._rows[np.ix_(recent, [cols[i] for i in known])]
+        # Somas por par de colunas, só nos minutos em que as duas têm retorno
+        present = ~np.isnan(values); mask = present.astype(np.float64); x = np.where(present, values, 0.0)
+        n = mask.T @ mask                   # n[i, j]: minutos em comum
+        sum_x = x.T @ mask                  # sum_x[i, j]: Σ retornos de i nos minutos em que j também tem
+        sum_xx = (x * x).T @ mask
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = sum_x / n
+            var = np.clip(sum_xx / n - mean ** 2, 0, None)
+            cov = (x.T @ x) / n - mean * mean.T
+            corr = cov / np.sqrt(var * var.T)
+        corr[n < self.min_rows] = np.nan
+        result[np.ix_(known, known)] = corr
+        return result
+
+    def select(self, signals: list, threshold: float = 0.8, max_per_cluster: int = 1, payouts: dict = None) -> list:
+        """
+        Agrupa os sinais cujo risco é o mesmo (correlação >= threshold na mesma direção,
+        ou <= -threshold em direções opostas) e mantém até max_per_cluster por grupo,
+        priorizando assertividade e depois payout.
+        """
+        if len(signals) < 2: return list(signals)
+        payouts = payouts or {}
+        ranked = sorted(signals, key=lambda s: (s.get('assertiveness', 0), payouts.get(s['pair'], 0)), reverse=True)
+        corr = self.matrix([s['pair'] for s in ranked])
+        sign = np.array([1.0 if s['signal'] == 'call' else -1.0 for s in ranked])
+        same_risk = np.nan_to_num(corr * np.outer(sign, sign), nan=0.0) >= threshold
+        clusters, kept = [], []
+        for i in range(len(ranked)):
+            cluster = next((c for c in clusters if same_risk[i, c[0]]), None)
+            if cluster is None: clusters.append([i]); kept.append(ranked[i])
+            elif len(cluster) < max_per_cluster: cluster.append(i); kept.append(ranked[i])
+        return kept
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+👥 SINALIZADOR ALPHA - Executores de Conta
+Cada executor recebe os sinais do motor de análise único e opera numa conta
+própria: sessão da API, limites de risco e diário de operações separados.
+O download de velas continua sendo feito uma única vez, pelo motor; as contas
+simuladas (PaperExecutor) usam essas mesmas velas e nunca chamam a API.
+"""
+
+import itertools
+import json
+import logging
+import re
+import threading
+import time
+from datetime import datetime
+
+from candle_store import BASE_TIMEFRAME
+from risk import RiskEngine
+
+logger = logging.getLogger(__name__)
+
+# Chaves herdadas da configuração principal quando a conta não as define
+INHERITED_KEYS = ('account_type', 'entry_value', 'stop_win', 'stop_loss', 'expiration')
+
+
+class AccountExecutor:
+    """Executa sinais numa conta da Exnova com sessão, stop_win/stop_loss e diário próprios."""
+
+    total_profit = property(lambda self: self.risk.total_profit)
+    total_operations = property(lambda self: self.risk.total_operations)
+    total_wins = property(lambda self: self.risk.total_wins)
+    total_losses = property(lambda self: self.risk.total_losses)
+
+    pool = None   # WorkerPool do bot para as ordens (None: uma thread por ordem)
+    tasks = None  # DelayedTasks do bot para conferir os resultados (None: um Timer por ordem)
+
+    def __init__(self, name: str, config: dict, min_payout: int = 85, clock=time):
+        self.name = name
+        self.config = config
+        self.clock = clock  # Horário do diário (virtual no replay)
+        self.min_payout = config.get('min_payout', min_payout)
+        self.exnova_api = None; self.connected = False; self.balance = 0.0
+        self.risk = RiskEngine()
+        self.journal_path = config.get('journal') or f"journal_{re.sub(r'[^A-Za-z0-9_-]+', '_', name)}.jsonl"
+        self._journal_lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, main_config: dict, min_payout: int = 85, candle_store=None, clock=time) -> list:
+        """Cria um executor para cada item de config['accounts'] ("paper": true cria uma conta simulada)."""
+        executors = []
+        for index, account in enumerate(main_config.get('accounts', [])):
+            account = dict(account)
+            for key in INHERITED_KEYS: account.setdefault(key, main_config.get(key))
+            name = account.get('name') or f"conta_{index + 1}"
+            if account.get('paper'): executors.append(PaperExecutor(name, account, candle_store, min_payout, clock))
+            else: executors.append(cls(name, account, min_payout, clock))
+        return executors
+
+    def connect(self) -> bool:
+        try:
+            from exnovaapi.stable_api import Exnova
+            self.exnova_api = Exnova(self.config['email'], self.config['password']); status, reason = self.exnova_api.connect()
+            if not status: logger.error(f"[{self.name}] Falha ao conectar: {reason}"); return False
+            self.exnova_api.change_balance(self.config.get('account_type', 'PRACTICE'))
+            self.balance = self.exnova_api.get_balance(); self.connected = True
+            logger.info(f"[{self.name}] Conectado ({self.config.get('account_type')}). Saldo: ${self.balance:.2f}")
+            return True
+        except Exception as e:
+            logger.error(f"[{self.name}] Exceção na conexão: {e}"); return False
+
+    def check_limits(self, pair: str, payouts: dict):
+        """Retorna o motivo do cancelamento ou None se a conta pode operar (sem contar ordens em aberto)."""
+        if not self.connected: return "conta desconectada"
+        if payouts.get(pair, 0) < self.min_payout: return "payout baixo"
+        return self.risk.limit_reached(self.config['stop_win'], self.config['stop_loss'])
+
+    def submit(self, pair: str, signal_data: dict, payouts: dict):
+        """Envia o sinal fora da thread do loop, para que todas as contas entrem na mesma vela."""
+        if self.pool is not None: self.pool.submit(self._execute, pair, signal_data, dict(payouts)); return
+        threading.Thread(target=self._execute, args=(pair, signal_data, dict(payouts)), daemon=True).start()
+
+    def _execute(self, pair, signal_data, payouts):
+        try:
+            reason = self.check_limits(pair, payouts)
+            if reason: logger.warning(f"[{self.name}] TRADE CANCELADO ({pair}): {reason}."); return
+            amount = float(self.config['entry_value']); direction = signal_data['signal']
+            expiration = int(signal_data.get('expiration') or self.config.get('expiration') or 1)
+            ticket, reason = self.risk.reserve(amount, self.config['stop_win'], self.config['stop_loss'])
+            if ticket is None: logger.warning(f"[{self.name}] TRADE CANCELADO ({pair}): {reason}."); return
+            try: status, order_id = self.exnova_api.buy(amount, pair, direction, expiration)
+            except Exception: self.risk.cancel(ticket); raise  # Ordem não enviada: a reserva não pode ficar presa
+            if not status:
+                self.risk.cancel(ticket)
+                logger.error(f"[{self.name}] Falha ao enviar ordem para {pair}. API: {order_id}")
+                self._journal('erro', pair=pair, direction=direction, amount=amount, detail=str(order_id)); return
+            self.risk.confirm(ticket)
+            logger.info(f"[{self.name}] Ordem {order_id} enviada: {direction.upper()} em {pair} | Valor ${amount}")
+            self._journal('ordem', order_id=order_id, pair=pair, direction=direction, amount=amount, expiration=expiration, assertiveness=signal_data.get('assertiveness'))
+            if self.tasks is not None: self.tasks.schedule(expiration * 60 + 5, self._check_result, order_id, pair, amount, ticket); return
+            timer = threading.Timer(expiration * 60 + 5, self._check_result, args=(order_id, pair, amount, ticket)); timer.daemon = True; timer.start()
+        except Exception as e:
+            logger.error(f"[{self.name}] Erro CRÍTICO ao executar trade em {pair}: {e}", exc_info=True)
+
+    def _check_result(self, order_id, pair, amount, ticket):
+        try:
+            result = self.exnova_api.check_win_v4(order_id); win_amount = 0
+            if isinstance(result, (tuple, list)) and len(result) > 0:
+                numeric_results = [val for val in result if isinstance(val, (int, float))]; win_amount = numeric_results[0] if numeric_results else 0
+            elif isinstance(result, (int, float)): win_amount = result
+            if win_amount > 0: profit = win_amount; status = 'WIN'
+            else: profit = -amount; status = 'LOSS'
+            self.risk.settle(ticket, profit); self.balance = self.exnova_api.get_balance()
+            logger.info(f"[{self.name}] Resultado {order_id}: {status} | Lucro: ${profit:.2f} | Saldo Atual: ${self.balance:.2f}")
+            self._journal('resultado', order_id=order_id, pair=pair, status=status, profit=profit, total_profit=self.total_profit, balance=self.balance)
+        except Exception as e:
+            logger.error(f"[{self.name}] Erro CRÍTICO ao verificar resultado do trade {order_id}: {e}", exc_info=True)
+            self.risk.cancel(ticket)
+
+    def _journal(self, event: str, **fields):
+        now = self.clock.time()
+        record = {'time': datetime.fromtimestamp(now).isoformat(timespec='seconds'), 'ts': now, 'account': self.name, 'event': event, **fields}
+        try:
+            with self._journal_lock, open(self.journal_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+        except OSError as e:
+            logger.error(f"[{self.name}] Erro ao gravar diário: {e}")
+
+
+class PaperExecutor(AccountExecutor):
+    """
+    Conta simulada: a ordem entra na vela atual e é preenchida com as velas que o
+    motor já baixa (abertura da vela de entrada e fechamento real da vela de
+    vencimento), sem nenhuma chamada à API. poll() resolve as ordens ao fim de
+    cada varredura e o diário registra os mesmos eventos de uma ordem real.
+    Com enforce_limits=False (modo 'Analisar' do bot) nenhuma ordem é recusada por
+    stop_win/stop_loss ou payout baixo, como no modo 'Analisar' original.
+    """
+
+    RESOLVE_TIMEOUT = 300  # s após o vencimento sem a vela de saída: a ordem é cancelada
+
+    def __init__(self, name: str, config: dict, candle_store, min_payout: int = 85, clock=time, enforce_limits: bool = True):
+        super().__init__(name, config, min_payout, clock)
+        self.candle_store = candle_store
+        self.enforce_limits = enforce_limits
+        self.connected = True
+        self.balance = float(config.get('paper_balance', 1000.0))
+        self._orders = []
+        self._orders_lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def connect(self) -> bool:
+        logger.info(f"[{self.name}] Conta simulada pronta. Saldo: ${self.balance:.2f}")
+        return True
+
+    def submit(self, pair: str, signal_data: dict, payouts: dict, on_update=None):
+        """Abre a ordem simulada na vela atual. Retorna a ordem ou None se foi cancelada pelos limites."""
+        reason = self.check_limits(pair, payouts) if self.enforce_limits else None
+        if reason: logger.warning(f"[{self.name}] TRADE CANCELADO ({pair}): {reason}."); return None
+        amount = float(signal_data.get('amount') or self.config['entry_value']); direction = signal_data['signal']
+        expiration = int(signal_data.get('expiration') or self.config.get('expiration') or 1)
+        # Sem limites a reserva só acompanha a exposição (ordens em aberto), nunca recusa
+        stop_win, stop_loss = (self.config['stop_win'], self.config['stop_loss']) if self.enforce_limits else (float('inf'), float('inf'))
+        ticket, reason = self.risk.reserve(amount, stop_win, stop_loss)
+        if ticket is None: logger.warning(f"[{self.name}] TRADE CANCELADO ({pair}): {reason}."); return None
+        self.risk.confirm(ticket)
+        entry_ts = int(self.clock.time() // BASE_TIMEFRAME * BASE_TIMEFRAME)
+        order = {'order_id': f"paper-{next(self._ids)}", 'pair': pair, 'direction': direction, 'amount': amount, 'expiration': expiration,
+                 'payout': payouts.get(pair) or self.min_payout, 'entry_ts': entry_ts, 'exit_ts': entry_ts + (expiration - 1) * BASE_TIMEFRAME,
+                 'entry_price': None, 'exit_price': None, 'status': 'AGUARDANDO', 'profit': 0.0, 'ticket': ticket, 'on_update': on_update}
+        with self._orders_lock: self._orders.append(order)
+        logger.info(f"[{self.name}] Ordem simulada {order['order_id']}: {direction.upper()} em {pair} | Valor ${amount} ({expiration}m)")
+        self._journal('ordem', order_id=order['order_id'], pair=pair, direction=direction, amount=amount, expiration=expiration, assertiveness=signal_data.get('assertiveness'))
+        return order
+
+    def watched_pairs(self) -> set:
+        """Pares com ordem em aberto: o motor precisa baixá-los em toda varredura até o resultado."""
+        with self._orders_lock: return {order['pair'] for order in self._orders}
+
+    def poll(self):
+        """Preenche e resolve as ordens cujas velas já estão no armazenamento."""
+        now = self.clock.time()
+        with self._orders_lock: orders = list(self._orders)
+        for order in orders:
+            try:
+                if order['status'] == 'AGUARDANDO': self._fill(order)
+                if order['status'] == 'ABERTA': self._resolve(order)
+                if order['status'] in ('AGUARDANDO', 'ABERTA') and now > order['exit_ts'] + BASE_TIMEFRAME + self.RESOLVE_TIMEOUT:
+                    self._cancel(order, 'CANCELADO (SEM VELAS)', "velas do par não chegaram")
+            except Exception as e:
+                logger.error(f"[{self.name}] Erro ao resolver a ordem simulada {order['order_id']}: {e}", exc_info=True)
+                self._cancel(order, 'ERRO', str(e))
+        with self._orders_lock: self._orders = [o for o in self._orders if o['status'] in ('AGUARDANDO', 'ABERTA')]
+
+    def _fill(self, order):
+        candle, _ = self.candle_store.candle_at(order['pair'], order['entry_ts'])
+        if candle is None: return
+        if self.config.get('enable_gap_filter', False):
+            previous, _ = self.candle_store.candle_at(order['pair'], order['entry_ts'] - BASE_TIMEFRAME)
+            if previous is not None and candle['open'] != previous['close']:
+                logger.warning(f"[{self.name}] TRADE CANCELADO ({order['pair']}): GAP DETECTADO."); self._cancel(order, 'CANCELADO (GAP)', "gap na abertura"); return
+        order['entry_price'] = candle['open']; order['status'] = 'ABERTA'
+        self._notify(order)
+
+    def _resolve(self, order):
+        candle, closed = self.candle_store.candle_at(order['pair'], order['exit_ts'])
+        if candle is None or not closed: return
+        order['exit_price'] = candle['close']
+        won = (order['direction'] == 'call' and order['exit_price'] > order['entry_price']) or (order['direction'] == 'put' and order['exit_price'] < order['entry_price'])
+        profit = order['amount'] * order['payout'] / 100.0 if won else -order['amount']
+        order['status'] = 'WIN' if won else 'LOSS'; order['profit'] = profit
+        self.risk.settle(order['ticket'], profit); self.balance += profit
+        logger.info(f"[{self.name}] Resultado {order['order_id']}: {order['status']} | Lucro: ${profit:.2f} | Saldo Simulado: ${self.balance:.2f}")
+        self._journal('resultado', order_id=order['order_id'], pair=order['pair'], status=order['status'], profit=profit, total_profit=self.total_profit,
+                      balance=self.balance, entry_price=order['entry_price'], exit_price=order['exit_price'])
+        self._notify(order)
+
+    def _cancel(self, order, status, detail):
+        order['status'] = status; self.risk.cancel(order['ticket'])
+        self._journal('erro', order_id=order['order_id'], pair=order['pair'], direction=order['direction'], amount=order['amount'], detail=detail)
+        self._notify(order)
+
+    def _notify(self, order):
+        if order['on_update']:
+            try: order['on_update'](order)
+            except Exception as e: logger.error(f"[{self.name}] Erro no retorno da ordem simulada: {e}")
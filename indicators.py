@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+📈 SINALIZADOR ALPHA - Indicadores em NumPy
+Versões em NumPy puro dos indicadores da biblioteca 'ta' usados pelas
+estratégias, com os mesmos resultados (inclusive os NaN do aquecimento),
+para analisar as velas sem montar DataFrames do pandas.
+"""
+
+import numpy as np
+
+
+def _ewm(values, alpha: float, min_periods: int) -> np.ndarray:
+    """Média exponencial recursiva, como pandas ewm(alpha=..., adjust=False): começa no primeiro valor válido."""
+    values = np.asarray(values, dtype=np.float64)
+    result = np.full(values.shape, np.nan)
+    valid = np.flatnonzero(~np.isnan(values))
+    if not len(valid): return result
+    start = valid[0]; current = values[start]; result[start] = current
+    for i in range(start + 1, len(values)):
+        value = values[i]
+        if value == value: current = (1.0 - alpha) * current + alpha * value  # value == value: não é NaN
+        result[i] = current
+    if min_periods > 1:
+        first = valid[min_periods - 1] if len(valid) >= min_periods else len(values)
+        result[:first] = np.nan
+    return result
+
+
+def ema(values, span: int) -> np.ndarray:
+    """EMA com span (ta.utils._ema): NaN até haver span valores."""
+    return _ewm(values, 2.0 / (span + 1), span)
+
+
+def sma(values, window: int) -> np.ndarray:
+    """Média móvel simples (pandas rolling(window).mean())."""
+    values = np.asarray(values, dtype=np.float64)
+    result = np.full(values.shape, np.nan)
+    if len(values) >= window:
+        cumsum = np.cumsum(np.insert(values, 0, 0.0))
+        result[window - 1:] = (cumsum[window:] - cumsum[:-window]) / window
+    return result
+
+
+def rsi(close, window: int = 14) -> np.ndarray:
+    """RSI de Wilder (ta.momentum.rsi)."""
+    close = np.asarray(close, dtype=np.float64)
+    diff = np.diff(close, prepend=np.nan)
+    up = np.where(diff > 0, diff, 0.0)
+    down = np.where(diff < 0, -diff, 0.0)
+    ema_up = _ewm(up, 1.0 / window, window); ema_down = _ewm(down, 1.0 / window, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(ema_down == 0, 100.0, 100.0 - 100.0 / (1.0 + ema_up / ema_down))
+
+
+def macd(close, fast: int = 12, slow: int = 26, sign: int = 9):
+    """Linha MACD e linha de sinal (ta.trend.MACD.macd() e .macd_signal())."""
+    line = ema(close, fast) - ema(close, slow)
+    return line, ema(line, sign)
+
+
+def average_true_range(high, low, close, window: int = 14) -> np.ndarray:
+    """ATR de Wilder (ta.volatility.average_true_range): zeros até a primeira média completa."""
+    high, low, close = (np.asarray(a, dtype=np.float64) for a in (high, low, close))
+    prev_close = np.concatenate(([np.nan], close[:-1]))
+    true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    atr = np.zeros(len(close))
+    if len(close) < window: return atr
+    atr[window - 1] = true_range[:window].mean()
+    for i in range(window, len(atr)):
+        atr[i] = (atr[i - 1] * (window - 1) + true_range[i]) / window
+    return atr
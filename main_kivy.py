@@ -11,7 +11,7 @@ import threading
 import time
 
 # Importa a classe do robô do seu arquivo original
-from SINALIZADOR_ALPHA_REAL import SinalizadorAlphaReal, EngulfingPatternStrategy, PocketOptionVolumeStrategy, MacdRsiReversalStrategy, HammerPatternStrategy
+from SINALIZADOR_ALPHA_REAL import SinalizadorAlphaReal
 
 # Classe para armazenar cores e facilitar o acesso no arquivo .kv
 class Colors(ObjectProperty):
@@ -107,6 +107,9 @@ class SinalizadorAlphaApp(App):
             else:
                 self.root.ids.trading_btn.text = "▶️ Iniciar Trading"
 
+        if 'strategies' in data: # Plugins recarregados pelo bot
+            self.root.ids.strategy_spinner.values = data['strategies']
+
         if 'dashboard' in data:
             dash = data['dashboard']
             self.root.ids.saldo_label.text = f"${dash.get('balance', 0):.2f}"
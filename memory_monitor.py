@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧠 SINALIZADOR ALPHA - Monitor de Memória
+Relatório periódico do consumo do processo para sessões de vários dias: RSS,
+objetos por tipo (e o quanto cresceram), maiores alocações do tracemalloc
+desde o relatório anterior, threads ativas e o tamanho das coleções do bot.
+Crescimento contínuo entre relatórios indica vazamento antes que a memória acabe.
+"""
+
+import gc
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+
+def rss_mb():
+    """Memória residente do processo em MB (None se não houver como medir nesta plataforma)."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1048576
+    except ImportError: pass
+    try:
+        with open('/proc/self/status', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('VmRSS:'): return int(line.split()[1]) / 1024
+    except OSError: pass
+    return None
+
+
+class FootprintMonitor:
+    """Gera o relatório a cada interval segundos numa thread própria (interval <= 0 desliga)."""
+
+    def __init__(self, interval: float = 900.0, top: int = 10, tracemalloc_frames: int = 1, thread_limit: int = 60, sizes: dict = None):
+        self.interval = interval
+        self.top = top
+        self.tracemalloc_frames = tracemalloc_frames  # 0 desliga o tracemalloc (tem custo em cada alocação)
+        self.thread_limit = thread_limit
+        self.sizes = dict(sizes or {})                # nome -> função que devolve o tamanho atual da coleção
+        self.last_report = None
+        self._counts = None; self._snapshot = None; self._thread = None
+
+    def start(self):
+        if self.interval <= 0 or self._thread: return
+        if self.tracemalloc_frames and not tracemalloc.is_tracing(): tracemalloc.start(self.tracemalloc_frames)
+        self._thread = threading.Thread(target=self._run, daemon=True, name='monitor-memoria'); self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try: self.report()
+            except Exception as e: logger.error(f"Erro no relatório de memória: {e}", exc_info=True)
+
+    def report(self) -> dict:
+        unreachable = gc.collect()
+        counts = Counter(type(obj).__name__ for obj in gc.get_objects())
+        growth = Counter({name: count - self._counts.get(name, 0) for name, count in counts.items()}) if self._counts else Counter()
+        self._counts = counts
+        report = {
+            'rss_mb': rss_mb(), 'pid': os.getpid(), 'threads': threading.active_count(),
+            'thread_names': Counter(t.name.rsplit('-', 1)[0] for t in threading.enumerate()).most_common(self.top),
+            'gc_objects': sum(counts.values()), 'gc_unreachable': unreachable, 'gc_counts': gc.get_count(),
+            'top_types': counts.most_common(self.top), 'type_growth': [(n, d) for n, d in growth.most_common(self.top) if d > 0],
+            'sizes': {}, 'top_allocations': [],
+        }
+        for name, size in self.sizes.items():
+            try: report['sizes'][name] = size()
+            except Exception as e: report['sizes'][name] = f"erro: {e}"
+        if tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot().filter_traces((tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__), tracemalloc.Filter(False, '<frozen importlib._bootstrap>')))
+            stats = snapshot.compare_to(self._snapshot, 'lineno') if self._snapshot else snapshot.statistics('lineno')
+            self._snapshot = snapshot
+            report['top_allocations'] = [(str(s.traceback[0]), round(s.size / 1024, 1), round(getattr(s, 'size_diff', 0) / 1024, 1)) for s in stats[:self.top]]
+        self._log(report)
+        self.last_report = report
+        return report
+
+    def _log(self, report):
+        rss = f"{report['rss_mb']:.1f} MB" if report['rss_mb'] is not None else "n/d"
+        logger.info(f"Memória: RSS {rss} | {report['gc_objects']} objetos ({report['gc_unreachable']} coletados) | {report['threads']} threads | "
+                    f"coleções: {', '.join(f'{k}={v}' for k, v in report['sizes'].items())}")
+        if report['type_growth']: logger.info("Memória: tipos que mais cresceram: " + ', '.join(f"{n} +{d}" for n, d in report['type_growth']))
+        for location, size_kb, diff_kb in report['top_allocations']: logger.info(f"Memória: {location}: {size_kb} KB ({diff_kb:+} KB)")
+        if report['threads'] > self.thread_limit:
+            logger.warning(f"Memória: {report['threads']} threads ativas (limite {self.thread_limit}): " + ', '.join(f"{n}={c}" for n, c in report['thread_names']))
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🎞️ SINALIZADOR ALPHA - Gravação e Replay de Sessões
+O gravador envolve a API da Exnova e salva cada resposta bruta (velas, ativos,
+ordens, resultados, saldo e o stream de velas dos pares prestes a operar) com o
+horário num arquivo binário compacto. O
+replay devolve essas respostas, na mesma ordem, ao pipeline do bot sem
+alterações, com um relógio virtual a 1x, 10x ou na velocidade máxima.
+
+Uso:  python replay.py sessao.rec [--speed 10 | --speed max]
+"""
+
+import argparse
+import heapq
+import itertools
+import json
+import logging
+import struct
+import threading
+import time
+import zlib
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'SAREC\x01'
+# Registro: horário (float64), código do método (uint8), tamanho do payload (uint32) + JSON comprimido [args, resposta]
+RECORD = struct.Struct('<dBI')
+# Novos métodos entram no fim da tupla: o código gravado é o índice
+METHODS = ('connect', 'get_candles', 'get_all_init_v2', 'buy', 'check_win_v4', 'get_balance', 'change_balance',
+           'start_candles_stream', 'stop_candles_stream', 'get_realtime_candles')
+# Argumento que identifica a fila de respostas de cada método (velas, ordens e streams por par, resultado por id)
+KEY_ARG = {'get_candles': 0, 'buy': 1, 'check_win_v4': 0, 'start_candles_stream': 0, 'stop_candles_stream': 0, 'get_realtime_candles': 0}
+# Resposta quando a gravação não tem mais dados para a chamada
+FALLBACKS = {'connect': (True, None), 'get_candles': None, 'get_all_init_v2': None, 'buy': (False, 'sem resposta gravada'),
+             'check_win_v4': None, 'get_balance': None, 'change_balance': None,
+             'start_candles_stream': None, 'stop_candles_stream': None, 'get_realtime_candles': None}
+
+
+def _key(method, args):
+    index = KEY_ARG.get(method)
+    return method, (str(args[index]) if index is not None and len(args) > index else None)
+
+
+class SessionRecorder:
+    """Proxy da API: repassa todas as chamadas e grava as respostas dos métodos de METHODS."""
+
+    def __init__(self, api, path: str, clock=time):
+        self._api = api
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._file = open(path, 'ab')
+        if self._file.tell() == 0: self._file.write(MAGIC)
+        self.path = path; self.records = 0
+
+    def __getattr__(self, name):
+        attr = getattr(self._api, name)
+        if name not in METHODS or not callable(attr): return attr
+        def recorded(*args):
+            result = attr(*args)
+            self._write(name, args, result)
+            return result
+        return recorded
+
+    def _write(self, method, args, result):
+        try: payload = zlib.compress(json.dumps([args, result], default=str, separators=(',', ':')).encode('utf-8'))
+        # RuntimeError: o dict do stream mudou durante a serialização (o websocket escreve nele em outra thread)
+        except (TypeError, ValueError, RuntimeError) as e: logger.warning(f"Gravação: resposta de {method} ignorada ({e})"); return
+        with self._lock:
+            self._file.write(RECORD.pack(self._clock.time(), METHODS.index(method), len(payload)) + payload); self._file.flush()
+            self.records += 1
+
+    def close(self):
+        with self._lock: self._file.close()
+
+
+def read_session(path: str):
+    """Gera (horário, método, args, resposta) na ordem em que foram gravados."""
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC: raise ValueError(f"{path} não é uma sessão gravada")
+        while True:
+            header = f.read(RECORD.size)
+            if len(header) < RECORD.size: return
+            ts, code, size = RECORD.unpack(header)
+            payload = f.read(size)
+            if len(payload) < size: logger.warning("Sessão truncada: último registro incompleto ignorado."); return
+            args, result = json.loads(zlib.decompress(payload))
+            yield ts, METHODS[code], args, result
+
+
+class VirtualClock:
+    """
+    Relógio do replay (mesma interface de time: time() e sleep()).
+    speed=N acelera o tempo N vezes. speed=None roda na velocidade máxima: sleep()
+    espera até o horário virtual chegar a agora + seconds, e só dois eventos movem
+    o relógio: as respostas gravadas (advance_to) e o sleep() da thread condutora
+    (a primeira que dorme; no bot, o loop de varredura), que avança pelos despertares
+    pendentes em ordem. Assim um trade dormindo não adianta o relógio da varredura e
+    a mesma gravação produz sempre a mesma sequência de chamadas. Antes de start()
+    o horário fica parado.
+    """
+
+    def __init__(self, start: float, speed: float = 1.0):
+        self.speed = speed
+        self._start = start
+        self._real_start = time.monotonic()
+        self._now = start
+        self._condition = threading.Condition()
+        self._wakeups = []                  # heap: (horário, ordem, callback ou None, args ou ficha do sleep)
+        self._order = itertools.count()
+        self._started = threading.Event()
+        self.driver = None                  # Thread condutora
+
+    def start(self):
+        self._started.set()
+
+    def time(self) -> float:
+        if self.speed: return self._start + (time.monotonic() - self._real_start) * self.speed
+        with self._condition: return self._now
+
+    def sleep(self, seconds: float):
+        if self.speed: time.sleep(max(0.0, seconds) / self.speed); return
+        if not self._started.is_set(): self._started.wait(min(max(0.0, seconds), 0.05)); return
+        current = threading.current_thread()
+        with self._condition:
+            target = self._now + max(0.0, seconds)
+            if self.driver is None or not self.driver.is_alive(): self.driver = current
+            if current is self.driver: self._advance(target); return
+            ticket = {'waiting': True}
+            heapq.heappush(self._wakeups, (target, next(self._order), None, ticket))
+            while ticket['waiting']: self._condition.wait()
+            ticket['awake'] = True; self._condition.notify_all()  # Avisa a condutora de que esta thread já acordou
+
+    def call_at(self, timestamp: float, callback, *args):
+        """Executa callback(*args) no horário virtual timestamp, na ordem dos demais despertares."""
+        if self.speed:
+            timer = threading.Timer(max(0.0, timestamp - self.time()) / self.speed, callback, args); timer.daemon = True; timer.start(); return
+        with self._condition: heapq.heappush(self._wakeups, (timestamp, next(self._order), callback, args))
+
+    def _advance(self, target):
+        # Chamado pela condutora com o lock: acorda cada pendência até target, uma de cada vez
+        while self._wakeups and self._wakeups[0][0] <= target:
+            when, _, callback, args = heapq.heappop(self._wakeups)
+            self._now = max(self._now, when)
+            if callback is None:
+                args['waiting'] = False; self._condition.notify_all()
+                while not args.get('awake'): self._condition.wait()
+            else:
+                self._condition.release()
+                try: callback(*args)
+                except Exception as e: logger.error(f"Erro em tarefa agendada no replay: {e}", exc_info=True)
+                finally: self._condition.acquire()
+        self._now = max(self._now, target)
+
+    def advance_to(self, timestamp: float):
+        if self.speed: return
+        with self._condition: self._now = max(self._now, timestamp)
+
+
+class ReplayApi:
+    """Substitui a Exnova: cada chamada recebe a próxima resposta gravada para o mesmo método (e par/ordem)."""
+
+    def __init__(self, path: str, clock: VirtualClock = None, speed: float = None):
+        self._queues = {}
+        self.start_time = None; self.end_time = None
+        for ts, method, args, result in read_session(path):
+            self._queues.setdefault(_key(method, args), deque()).append((ts, result))
+            if self.start_time is None: self.start_time = ts
+            self.end_time = ts
+        if self.start_time is None: raise ValueError(f"{path} não contém registros")
+        self.clock = clock or VirtualClock(self.start_time, speed)
+        self._lock = threading.Lock()
+        self._candles_left = sum(len(q) for (method, _), q in self._queues.items() if method == 'get_candles')
+        self.finished = threading.Event()  # Todas as respostas de velas foram consumidas
+        self.calls = 0; self.misses = 0
+
+    def _serve(self, method, args):
+        with self._lock:
+            self.calls += 1
+            queue = self._queues.get(_key(method, args))
+            if not queue:
+                self.misses += 1
+                if method == 'get_candles' and not self._candles_left: self.finished.set()
+                return FALLBACKS[method]
+            ts, result = queue.popleft()
+            if method == 'get_candles':
+                self._candles_left -= 1
+                if not self._candles_left: self.finished.set()
+        self.clock.advance_to(ts)
+        return result
+
+    def connect(self): return tuple(self._serve('connect', ()) or FALLBACKS['connect'])
+    def get_candles(self, pair, size, count, end): return self._serve('get_candles', (pair, size, count, end))
+    def get_all_init_v2(self): return self._serve('get_all_init_v2', ())
+    def buy(self, amount, pair, direction, expiration): return tuple(self._serve('buy', (amount, pair, direction, expiration)) or FALLBACKS['buy'])
+    def check_win_v4(self, order_id): return self._serve('check_win_v4', (order_id,))
+    def get_balance(self): return self._serve('get_balance', ()) or 0.0
+    def change_balance(self, account_type): return self._serve('change_balance', (account_type,))
+    def start_candles_stream(self, pair, size, maxdict): return self._serve('start_candles_stream', (pair, size, maxdict))
+    def stop_candles_stream(self, pair, size): return self._serve('stop_candles_stream', (pair, size))
+    def get_realtime_candles(self, pair, size): return self._serve('get_realtime_candles', (pair, size)) or {}
+
+
+def replay_session(path: str, speed: float = None, config: dict = None, timeout: float = None) -> dict:
+    """Roda o bot sem interface sobre uma sessão gravada e devolve um resumo para comparar execuções."""
+    from SINALIZADOR_ALPHA_REAL import SinalizadorAlphaReal
+
+    api = ReplayApi(path, speed=speed)
+    api.clock.advance_to(api.start_time)
+    bot = SinalizadorAlphaReal(gui_mode='replay', clock=api.clock)
+    bot.config.update(config or {}); bot.config['record_session'] = ''
+    bot.executors = []; bot.asset_cache_file = None  # Sem contas extras nem cache do disco no replay
+    real_start = time.monotonic()
+    bot.exnova_api = api; api.connect(); bot.update_connection_success()
+    while not bot.available_otc_pairs and not api.finished.is_set(): time.sleep(0.05)
+    api.clock.start(); bot.toggle_real_trading()
+    if not api.finished.wait(timeout): logger.warning("Replay interrompido pelo tempo limite.")
+    bot.stop_trading()
+    summary = {'calls': api.calls, 'misses': api.misses, 'sweeps': bot.candle_clock.sweeps, 'deadline_misses': bot.candle_clock.deadline_misses,
+               'signals': [(s['pair'], s['direction'], s['status']) for s in list(bot.signals)], 'wall_time': time.monotonic() - real_start,
+               'session_time': api.end_time - api.start_time, **bot.risk.snapshot()}
+    logger.info(f"Replay concluído: {summary['sweeps']} varreduras, {len(summary['signals'])} sinais, {summary['misses']} chamadas sem resposta gravada, "
+                f"{summary['session_time'] / 60:.0f} min de sessão em {summary['wall_time']:.1f}s.")
+    return summary
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Reexecuta uma sessão gravada com config['record_session'].")
+    parser.add_argument('session', help="Arquivo .rec gravado")
+    parser.add_argument('--speed', default='max', help="Multiplicador de velocidade (1, 10, ...) ou 'max'")
+    parser.add_argument('--timeout', type=float, default=None, help="Tempo real máximo (s)")
+    options = parser.parse_args()
+    result = replay_session(options.session, None if options.speed == 'max' else float(options.speed), timeout=options.timeout)
+    print(json.dumps(result, indent=2, ensure_ascii=False, default=str))
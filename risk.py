@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🛡️ SINALIZADOR ALPHA - Motor de Risco
+Guarda o P&L de uma conta com atualizações atômicas. Cada ordem reserva sua
+exposição antes de ser enviada e a libera quando o resultado chega, então os
+limites de stop_win/stop_loss consideram também as ordens ainda em aberto.
+Todas as operações são O(1) e seguras entre as threads de trade.
+"""
+
+import itertools
+import threading
+
+
+class RiskEngine:
+    """P&L realizado e exposição pendente de uma conta, protegidos por um lock."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tickets = itertools.count(1)
+        self._reservations = {}  # ticket -> valor em risco
+        self.total_profit = 0.0
+        self.total_operations = 0
+        self.total_wins = 0
+        self.total_losses = 0
+        self.pending_exposure = 0.0
+
+    @staticmethod
+    def _limit_reason(profit, exposure, stop_win, stop_loss):
+        if profit >= stop_win: return "Meta Stop Win atingida"
+        if profit < 0 and abs(profit) >= stop_loss: return "Limite Stop Loss atingido"
+        if profit - exposure < -stop_loss: return "Limite Stop Loss seria ultrapassado pelas ordens em aberto"
+        return None
+
+    def limit_reached(self, stop_win: float, stop_loss: float):
+        """Motivo para parar de operar (só com o P&L realizado) ou None."""
+        with self._lock:
+            profit = self.total_profit
+        if profit >= stop_win: return "Meta Stop Win atingida"
+        if profit < 0 and abs(profit) >= stop_loss: return "Limite Stop Loss atingido"
+        return None
+
+    def reserve(self, amount: float, stop_win: float, stop_loss: float):
+        """
+        Reserva a exposição de uma nova ordem. Retorna (ticket, None) ou (None, motivo)
+        quando a perda máxima possível (realizado - pendente - amount) passaria do stop_loss.
+        """
+        with self._lock:
+            reason = self._limit_reason(self.total_profit, self.pending_exposure + amount, stop_win, stop_loss)
+            if reason: return None, reason
+            ticket = next(self._tickets)
+            self._reservations[ticket] = amount; self.pending_exposure += amount
+            return ticket, None
+
+    def confirm(self, ticket):
+        """Ordem aceita pela corretora: conta a operação (a exposição segue reservada)."""
+        with self._lock:
+            if ticket in self._reservations: self.total_operations += 1
+
+    def cancel(self, ticket):
+        """Ordem não enviada: libera a exposição sem afetar o P&L."""
+        with self._lock:
+            amount = self._reservations.pop(ticket, None)
+            if amount is not None: self.pending_exposure -= amount
+
+    def settle(self, ticket, profit: float):
+        """Resultado da ordem: libera a exposição e aplica o lucro/prejuízo."""
+        with self._lock:
+            amount = self._reservations.pop(ticket, None)
+            if amount is not None: self.pending_exposure -= amount
+            self._apply(profit)
+
+    def record_simulated(self, profit: float):
+        """Resultado de uma ordem simulada (modo 'Analisar'): conta W/L sem alterar o P&L."""
+        with self._lock:
+            if profit > 0: self.total_wins += 1
+            else: self.total_losses += 1
+
+    def count_operation(self):
+        with self._lock:
+            self.total_operations += 1
+
+    def _apply(self, profit):
+        self.total_profit += profit
+        if profit > 0: self.total_wins += 1
+        else: self.total_losses += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {'total_profit': self.total_profit, 'total_operations': self.total_operations, 'wins': self.total_wins,
+                    'losses': self.total_losses, 'pending_exposure': self.pending_exposure, 'open_orders': len(self._reservations)}
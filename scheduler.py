@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🗓️ SINALIZADOR ALPHA - Agendador de Varredura
+Define a ordem em que os pares são analisados a cada varredura: primeiro os de
+maior payout, com sinais recentes e mais voláteis. Os melhores pares são
+varridos sempre; os demais, a cada N varreduras. As varreduras começam logo
+após o fechamento de cada vela e têm um prazo para terminar.
+Os trades rodam num conjunto fixo de threads, com uma única thread de agendamento.
+"""
+
+import heapq
+import itertools
+import logging
+import queue
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class PairScheduler:
+    """Prioriza os pares por payout, frequência recente de sinais e volatilidade."""
+
+    PAYOUT_WEIGHT = 0.5
+    SIGNAL_WEIGHT = 0.3
+    VOLATILITY_WEIGHT = 0.2
+
+    def __init__(self, top_pairs: int = 20, rescan_interval: int = 3, signal_window: float = 3600.0, max_signal_count: int = 5, clock=time):
+        self.top_pairs = top_pairs              # Pares varridos em toda varredura
+        self.rescan_interval = rescan_interval  # Os demais são varridos a cada N varreduras
+        self.signal_window = signal_window      # Janela (s) para contar sinais recentes
+        self.max_signal_count = max_signal_count
+        self.clock = clock                      # Qualquer objeto com time(); o módulo time por padrão
+        self.sweep = 0
+        self._lock = threading.Lock()
+        self._signal_times = {}   # par -> horários dos últimos sinais
+        self._last_scanned = {}   # par -> número da última varredura em que foi analisado
+        self._deferred = set()    # Pares que o prazo cortou na varredura anterior
+
+    def record_signal(self, pair: str, timestamp: float = None):
+        self._signal_times.setdefault(pair, deque(maxlen=self.max_signal_count)).append(timestamp or self.clock.time())
+
+    def recent_signals(self, pair: str, now: float) -> int:
+        return sum(1 for ts in self._signal_times.get(pair, ()) if now - ts <= self.signal_window)
+
+    def scores(self, pairs, payouts: dict, min_payout: int, volatility=None) -> dict:
+        """Pontuação de 0 a 1 por par (apenas pares com payout >= min_payout)."""
+        now = self.clock.time()
+        eligible = [p for p in pairs if payouts.get(p, 0) >= min_payout]
+        vols = {p: (volatility(p) if volatility else 0.0) or 0.0 for p in eligible}
+        max_vol = max(vols.values(), default=0.0) or 1.0
+        payout_span = max(1, 100 - min_payout)
+        return {p: self.PAYOUT_WEIGHT * min(1.0, (payouts.get(p, 0) - min_payout) / payout_span)
+                   + self.SIGNAL_WEIGHT * self.recent_signals(p, now) / self.max_signal_count
+                   + self.VOLATILITY_WEIGHT * vols[p] / max_vol
+                for p in eligible}
+
+    def plan(self, pairs, payouts: dict, min_payout: int, volatility=None) -> list:
+        """
+        Lista ordenada de pares a varrer nesta varredura: os top_pairs, depois os cortados
+        pelo prazo na varredura anterior, depois os demais cuja vez chegou. Pares abaixo do
+        payout mínimo nem são baixados. Só mark_scanned() conta um par como varrido.
+        """
+        scores = self.scores(pairs, payouts, min_payout, volatility)
+        ranked = sorted(scores, key=lambda p: scores[p], reverse=True)
+        with self._lock:
+            self.sweep += 1
+            top = ranked[:self.top_pairs]
+            deferred = [p for p in ranked[self.top_pairs:] if p in self._deferred]
+            due = [p for p in ranked[self.top_pairs:]
+                   if p not in self._deferred and self.sweep - self._last_scanned.get(p, -self.rescan_interval) >= self.rescan_interval]
+            self._deferred = set()
+        return top + deferred + due
+
+    def mark_scanned(self, pair: str):
+        with self._lock: self._last_scanned[pair] = self.sweep
+
+    def defer(self, pairs):
+        """Pares planejados que o prazo cortou: entram na frente da próxima varredura."""
+        with self._lock: self._deferred.update(pairs)
+
+
+class CandleClock:
+    """
+    Alinha as varreduras ao fechamento das velas: cada varredura começa logo após
+    a virada do minuto (quando iloc[-2] acabou de fechar) e deve terminar dentro
+    de um prazo. Atrasos são contados e registrados no log.
+    """
+
+    def __init__(self, period: int = 60, offset: float = 1.0, deadline: float = 20.0, clock=time):
+        self.period = period        # Duração da vela (s)
+        self.offset = offset        # Espera após a virada para a API já ter a vela fechada
+        self.deadline = deadline    # Prazo (s) para terminar a varredura após o início
+        self.clock = clock          # Qualquer objeto com time() e sleep(); o módulo time por padrão
+        self.sweeps = 0; self.deadline_misses = 0; self.last_duration = 0.0
+        self._boundary = None; self._started = None
+
+    def next_boundary(self, now: float = None) -> float:
+        now = self.clock.time() if now is None else now
+        return (now // self.period + 1) * self.period
+
+    def wait_for_next_candle(self) -> float:
+        """Dorme até logo após a próxima virada de vela e retorna o horário da virada."""
+        boundary = self.next_boundary()
+        self.clock.sleep(max(0.0, boundary + self.offset - self.clock.time()))
+        self._boundary = boundary
+        return boundary
+
+    def begin_sweep(self):
+        self._started = self.clock.time()
+        if self._boundary is None: self._boundary = self._started - self.offset
+
+    def past_deadline(self) -> bool:
+        return self._started is not None and self.clock.time() - self._started > self.deadline
+
+    def end_sweep(self, scanned: int, skipped: int = 0) -> bool:
+        """Fecha a varredura; retorna False (e registra) se o prazo foi perdido."""
+        self.sweeps += 1; self.last_duration = self.clock.time() - self._started
+        lag = self._started - self._boundary
+        self._started = None; self._boundary = None
+        if self.last_duration <= self.deadline and not skipped: return True
+        self.deadline_misses += 1
+        logger.warning(f"Varredura fora do prazo: {self.last_duration:.1f}s (prazo {self.deadline:.0f}s, início {lag:.1f}s após a vela), "
+                       f"{scanned} pares analisados, {skipped} adiados. Atrasos: {self.deadline_misses}/{self.sweeps}.")
+        return False
+
+
+class WorkerPool:
+    """Número fixo de threads (daemon) para os trades; tarefas além disso esperam na fila."""
+
+    def __init__(self, max_workers: int = 8, name: str = 'trade'):
+        self.max_workers = max(1, int(max_workers))
+        self.name = name
+        self._queue = queue.Queue()
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args):
+        self._queue.put((fn, args))
+        with self._lock:
+            # Threads criadas sob demanda, até o limite
+            if len(self._threads) < self.max_workers and self._queue.qsize() > 0:
+                thread = threading.Thread(target=self._worker, daemon=True, name=f"{self.name}-{len(self._threads) + 1}")
+                self._threads.append(thread); thread.start()
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _worker(self):
+        while True:
+            fn, args = self._queue.get()
+            try: fn(*args)
+            except Exception as e: logger.error(f"Erro em tarefa de {self.name}: {e}", exc_info=True)
+
+
+class DelayedTasks:
+    """
+    Uma única thread com a fila (heap) de tarefas agendadas, em vez de um Timer por
+    trade. Na hora certa a tarefa é entregue ao WorkerPool. Com o relógio virtual do
+    replay (que tem call_at), a tarefa roda na thread que conduz o relógio, no horário
+    virtual exato, para o replay ser determinístico.
+    """
+
+    def __init__(self, pool: WorkerPool, clock=time):
+        self.pool = pool
+        self.clock = clock
+        self._heap = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        threading.Thread(target=self._run, daemon=True, name='agendador').start()
+
+    def schedule(self, delay: float, fn, *args):
+        if hasattr(self.clock, 'call_at'): self.clock.call_at(self.clock.time() + max(0.0, delay), fn, *args); return
+        with self._condition:
+            heapq.heappush(self._heap, (self.clock.time() + max(0.0, delay), next(self._counter), fn, args))
+            self._condition.notify()
+
+    def __len__(self):
+        with self._condition: return len(self._heap)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._heap: self._condition.wait()
+                wait = self._heap[0][0] - self.clock.time()
+                if wait > 0:
+                    self._condition.wait(wait if self.clock is time else 0.05); continue
+                _, _, fn, args = heapq.heappop(self._heap)
+            self.pool.submit(fn, *args)
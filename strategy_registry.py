@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧩 SINALIZADOR ALPHA - Registro de Estratégias
+Junta as estratégias embutidas com as encontradas na pasta de plugins
+(strategies/*.py) e nos entry points 'sinalizador_alpha.strategies', aplica os
+parâmetros de config['strategy_params'] e recarrega entre as varreduras os
+plugins alterados, sem reiniciar o bot nem perder as velas em memória.
+
+Um plugin é qualquer subclasse de TradingStrategyReal:
+
+    from SINALIZADOR_ALPHA_REAL import TradingStrategyReal
+
+    class MinhaEstrategia(TradingStrategyReal):
+        def __init__(self, config):
+            super().__init__("Minha Estratégia (70%)", config)
+        def analyze(self, data):
+            ...
+"""
+
+import importlib.util
+import inspect
+import json
+import logging
+import os
+import sys
+
+logger = logging.getLogger(__name__)
+
+PLUGIN_DIR = 'strategies'
+ENTRY_POINT_GROUP = 'sinalizador_alpha.strategies'
+PLUGIN_PACKAGE = 'sinalizador_alpha_plugins'  # Prefixo dos módulos carregados da pasta de plugins
+
+
+class StrategyRegistry:
+    """Classes de estratégia disponíveis e suas instâncias configuradas (nome exibido -> instância)."""
+
+    def __init__(self, base_class, builtin: dict, plugin_dir: str = PLUGIN_DIR, entry_point_group: str = ENTRY_POINT_GROUP):
+        self.base_class = base_class
+        self.builtin = list(builtin.values())
+        self.plugin_dir = plugin_dir
+        self.entry_point_group = entry_point_group
+        self.strategies = {}
+        self._plugins = {}       # caminho -> (mtime, [classes])
+        self._entry_points = None
+        self._params = None      # strategy_params aplicados na última construção
+
+    def _plugin_files(self):
+        if not self.plugin_dir or not os.path.isdir(self.plugin_dir): return {}
+        files = {}
+        for entry in sorted(os.listdir(self.plugin_dir)):
+            if entry.endswith('.py') and not entry.startswith('_'):
+                path = os.path.join(self.plugin_dir, entry); files[path] = os.path.getmtime(path)
+        return files
+
+    def _load_module_classes(self, path):
+        name = f"{PLUGIN_PACKAGE}.{os.path.splitext(os.path.basename(path))[0]}"
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        try: spec.loader.exec_module(module)
+        except Exception: sys.modules.pop(name, None); raise
+        # Só as classes definidas no próprio plugin (não as importadas dele, como a classe base)
+        return [cls for _, cls in inspect.getmembers(module, inspect.isclass) if issubclass(cls, self.base_class) and cls.__module__ == name]
+
+    def _load_entry_points(self):
+        classes = []
+        try:
+            from importlib.metadata import entry_points
+            found = entry_points(group=self.entry_point_group) if sys.version_info >= (3, 10) else entry_points().get(self.entry_point_group, [])
+        except Exception as e:
+            logger.warning(f"Não foi possível listar os entry points de estratégias: {e}"); return classes
+        for entry_point in found:
+            try:
+                cls = entry_point.load()
+                if inspect.isclass(cls) and issubclass(cls, self.base_class): classes.append(cls)
+                else: logger.warning(f"Entry point '{entry_point.name}' não é uma estratégia; ignorado.")
+            except Exception as e: logger.error(f"Erro ao carregar a estratégia do entry point '{entry_point.name}': {e}")
+        return classes
+
+    def _scan_plugins(self) -> bool:
+        """Importa os plugins novos ou alterados; retorna True se o conjunto de classes mudou."""
+        changed = False
+        files = self._plugin_files()
+        for path in list(self._plugins):
+            if path not in files:
+                logger.info(f"Plugin removido: {path}"); del self._plugins[path]; changed = True
+        for path, mtime in files.items():
+            if path in self._plugins and self._plugins[path][0] == mtime: continue
+            try:
+                classes = self._load_module_classes(path)
+                logger.info(f"Plugin {'recarregado' if path in self._plugins else 'carregado'}: {path} ({', '.join(c.__name__ for c in classes) or 'nenhuma estratégia'})")
+            except Exception as e:
+                # Mantém a versão anterior em uso; tenta de novo só quando o arquivo mudar outra vez
+                logger.error(f"Erro ao carregar o plugin {path}: {e}")
+                self._plugins[path] = (mtime, self._plugins.get(path, (None, []))[1]); continue
+            self._plugins[path] = (mtime, classes); changed = True
+        return changed
+
+    def refresh(self, config: dict) -> bool:
+        """
+        Recarrega plugins alterados e reconstrói as instâncias se as classes ou
+        config['strategy_params'] mudaram. Retorna True quando self.strategies foi trocado.
+        """
+        changed = self._scan_plugins()
+        if self._entry_points is None: self._entry_points = self._load_entry_points(); changed = True
+        params = config.get('strategy_params') or {}
+        if not changed and params == self._params: return False
+        self.strategies = self._build(config, params); self._params = json.loads(json.dumps(params))
+        return True
+
+    def _build(self, config, params):
+        strategies = {}
+        plugin_classes = [cls for _, classes in self._plugins.values() for cls in classes]
+        for cls in self.builtin + self._entry_points + plugin_classes:
+            try: strategy = cls(config)
+            except Exception as e: logger.error(f"Erro ao criar a estratégia {cls.__name__}: {e}"); continue
+            self.apply_params(strategy, params.get(strategy.name, {}))
+            if strategy.name in strategies: logger.info(f"Estratégia '{strategy.name}' substituída por {cls.__module__}.{cls.__name__}.")
+            strategies[strategy.name] = strategy
+        return strategies
+
+    @staticmethod
+    def apply_params(strategy, params: dict):
+        """Sobrescreve atributos já existentes da estratégia (ex.: RSI_PERIOD, ASSERTIVENESS)."""
+        for key, value in params.items():
+            if not hasattr(strategy, key) or key.startswith('_') or callable(getattr(strategy, key)):
+                logger.warning(f"Parâmetro desconhecido '{key}' para a estratégia '{strategy.name}'; ignorado."); continue
+            current = getattr(strategy, key)
+            if isinstance(current, tuple) and isinstance(value, list): value = tuple(value)
+            setattr(strategy, key, value)
@@ -0,0 +1,68 @@
+from candle_store import CandleStore
+
+START = 1_700_000_100 // 300 * 300  # Início de uma barra de 5m
+
+
+def raw(start, count, price=1.0):
+    """Resposta de get_candles: count velas de 1m, a última em formação."""
+    return [{'from': start + i * 60, 'open': price + i, 'max': price + i + 0.5, 'min': price + i - 0.5, 'close': price + i + 0.25, 'volume': 1}
+            for i in range(count)]
+
+
+def test_aggregates_complete_bars_and_keeps_the_forming_one():
+    store = CandleStore(timeframes=[300])
+    store.update('A', raw(START, 12))  # 11 fechadas: duas barras de 5m completas + 1 vela da terceira; a 12ª está em formação
+    bars = store.candles('A', 300)
+    assert [b['timestamp'] for b in bars] == [START, START + 300, START + 600]
+    first = bars[0]
+    assert (first['open'], first['high'], first['low'], first['close'], first['volume']) == (1.0, 5.5, 0.5, 5.25, 5.0)
+    assert bars[-1]['close'] == 11.25  # Barra em formação: velas de 1m já fechadas do período
+
+
+def test_partial_first_bar_is_dropped():
+    store = CandleStore(timeframes=[300])
+    store.update('A', raw(START + 120, 10))
+    assert store.candles('A', 300)[0]['timestamp'] == START + 300
+
+
+def test_incremental_updates_match_a_single_update():
+    once, incremental = CandleStore(timeframes=[300]), CandleStore(timeframes=[300])
+    candles = raw(START, 30)
+    once.update('A', candles)
+    for end in range(5, 31, 5): incremental.update('A', candles[max(0, end - 7):end])
+    assert incremental.candles('A', 300) == once.candles('A', 300)
+    assert incremental.candles('A') == once.candles('A')
+
+
+def test_new_timeframe_is_rebuilt_from_stored_candles():
+    store = CandleStore(timeframes=[60])
+    store.update('A', raw(START, 31))
+    store.add_timeframe(300)
+    bars = store.candles('A', 300)
+    assert len(bars) == 7  # 6 barras fechadas + a 7ª, aberta pela vela em formação
+    assert (bars[-1]['timestamp'], bars[-1]['close']) == (START + 1800, 31.25)
+
+
+def test_forming_bar_exists_on_the_first_minute_of_a_period():
+    store = CandleStore(timeframes=[300])
+    store.update('A', raw(START, 11))  # A 11ª vela (em formação) abre a terceira barra
+    assert [b['timestamp'] for b in store.candles('A', 300)] == [START, START + 300, START + 600]
+    assert store.candles('A', 300)[-2]['close'] == 10.25  # [-2] é a última barra fechada
+    store.update('A', raw(START, 12)[-2:])  # A vela 11 fecha: substitui a que abriu a barra, sem somar duas vezes
+    bar = store.candles('A', 300)[-1]
+    assert (bar['timestamp'], bar['close'], bar['volume']) == (START + 600, 11.25, 1.0)
+
+
+def test_history_length_covers_the_largest_timeframe():
+    store = CandleStore(timeframes=[60, 900], window=100)
+    candles = raw(START, store.history_length(100))
+    store.update('A', candles)
+    assert len(store.candles('A', 900)) >= 101
+    assert CandleStore(timeframes=[60], window=100).history_length(100) == 100
+
+
+def test_fetch_count_asks_only_for_missing_candles():
+    store = CandleStore()
+    assert store.fetch_count('A', START, 100) == 100
+    store.update('A', raw(START, 10))
+    assert store.fetch_count('A', START + 10 * 60 + 5, 100) == 3
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from correlation import ReturnCorrelation
+
+START = 1_700_000_040 // 60 * 60
+
+
+def candles(returns, start=START, price=1.0):
+    """Velas de 1m cujos fechamentos seguem os retornos dados (a primeira só serve de base)."""
+    closes = price * np.cumprod(np.concatenate(([1.0], 1.0 + np.asarray(returns))))
+    return [{'timestamp': start + i * 60, 'close': float(c)} for i, c in enumerate(closes)]
+
+
+def correlated_returns(n=99, rho=0.92, seed=7):
+    rng = np.random.default_rng(seed)
+    a = rng.normal(0, 1e-3, n); noise = rng.normal(0, 1e-3, n)
+    b = rho * a + np.sqrt(1 - rho ** 2) * noise
+    c = rng.normal(0, 1e-3, n)
+    return a, b, c
+
+
+def test_startup_histories_are_aligned_by_timestamp():
+    # Na partida cada par chega com o histórico completo, um depois do outro
+    a, b, c = correlated_returns()
+    corr = ReturnCorrelation(window=60)
+    for pair, returns in (('A', a), ('B', b), ('C', c)): corr.observe(pair, candles(returns))
+    m = corr.matrix(['A', 'B', 'C'])
+    expected = np.corrcoef(a[-60:], b[-60:])[0, 1]  # Janela de 60 minutos
+    assert m[0, 1] == pytest.approx(expected, abs=1e-9)
+    assert m[0, 1] > 0.85
+    assert abs(m[1, 2]) < 0.3
+
+
+def test_missing_returns_are_not_zero():
+    # C só é varrido a cada 3 minutos: os minutos sem retorno não entram na correlação
+    a, b, _ = correlated_returns()
+    corr = ReturnCorrelation(window=60)
+    corr.observe('A', candles(a))
+    series = candles(b)
+    for i in range(0, len(series), 3): corr.observe('B', series[i:i + 2])
+    present = [i for i in range(len(b)) if i % 3 == 0 and i >= len(b) - 60]
+    m = corr.matrix(['A', 'B'])
+    assert m[0, 1] == pytest.approx(np.corrcoef(a[present], b[present])[0, 1], abs=1e-9)
+
+
+def test_incremental_observation_rolls_the_window():
+    a, b, _ = correlated_returns(n=200)
+    corr = ReturnCorrelation(window=60)
+    sa, sb = candles(a), candles(b)
+    corr.observe('A', sa[:100]); corr.observe('B', sb[:100])
+    for i in range(100, len(sa)):
+        corr.observe('A', [sa[i]]); corr.observe('B', [sb[i]])
+    assert corr.matrix(['A', 'B'])[0, 1] == pytest.approx(np.corrcoef(a[-60:], b[-60:])[0, 1], abs=1e-9)
+
+
+def test_too_few_common_minutes_is_nan():
+    a, b, _ = correlated_returns(n=10)
+    corr = ReturnCorrelation(window=60, min_rows=15)
+    corr.observe('A', candles(a)); corr.observe('B', candles(b))
+    assert np.isnan(corr.matrix(['A', 'B'])[0, 1])
+    assert np.isnan(corr.matrix(['A', 'X'])[0, 1])
+
+
+def test_select_keeps_best_signal_of_each_cluster():
+    a, b, c = correlated_returns()
+    corr = ReturnCorrelation(window=60)
+    for pair, returns in (('A', a), ('B', b), ('C', c)): corr.observe(pair, candles(returns))
+    signals = [{'pair': 'A', 'signal': 'call', 'assertiveness': 70}, {'pair': 'B', 'signal': 'call', 'assertiveness': 80},
+               {'pair': 'C', 'signal': 'call', 'assertiveness': 60}]
+    assert [s['pair'] for s in corr.select(signals, threshold=0.8)] == ['B', 'C']
+    # Direções opostas em pares correlacionados são riscos diferentes
+    signals[0]['signal'] = 'put'
+    assert [s['pair'] for s in corr.select(signals, threshold=0.8)] == ['B', 'A', 'C']
@@ -0,0 +1,35 @@
+import json
+
+from candle_store import CandleStore
+from executors import PaperExecutor
+
+START = 1_700_000_100 // 300 * 300
+
+
+class Clock:
+    def __init__(self, now): self.now = now
+    def time(self): return self.now
+
+
+def executor(tmp_path, clock, **kwargs):
+    config = {'entry_value': 10, 'stop_win': 100, 'stop_loss': 5, 'expiration': 1, 'journal': str(tmp_path / 'journal.jsonl')}
+    return PaperExecutor('t', config, CandleStore(), clock=clock, **kwargs)
+
+
+def test_analysis_mode_ignores_stops_and_payout(tmp_path):
+    paper = executor(tmp_path, Clock(START), enforce_limits=False)
+    assert paper.submit('A', {'signal': 'call'}, {'A': 0}) is not None  # Payout baixo e entrada acima do stop_loss
+    assert paper.submit('A', {'signal': 'put'}, {}) is not None
+    assert paper.risk.pending_exposure == 20
+
+
+def test_paper_account_keeps_its_limits(tmp_path):
+    paper = executor(tmp_path, Clock(START))
+    assert paper.submit('A', {'signal': 'call'}, {'A': 90}) is None  # 10 em risco passaria do stop_loss de 5
+
+
+def test_journal_uses_the_injected_clock(tmp_path):
+    paper = executor(tmp_path, Clock(START + 30), enforce_limits=False)
+    paper.submit('A', {'signal': 'call'}, {'A': 90})
+    record = json.loads((tmp_path / 'journal.jsonl').read_text(encoding='utf-8').splitlines()[0])
+    assert record['ts'] == START + 30 and record['event'] == 'ordem'
@@ -0,0 +1,58 @@
+import threading
+
+from risk import RiskEngine
+
+
+def test_reserve_confirm_settle():
+    risk = RiskEngine()
+    ticket, reason = risk.reserve(10, stop_win=100, stop_loss=50)
+    assert reason is None and risk.pending_exposure == 10
+    risk.confirm(ticket)
+    risk.settle(ticket, -10)
+    assert risk.snapshot() == {'total_profit': -10, 'total_operations': 1, 'wins': 0, 'losses': 1, 'pending_exposure': 0, 'open_orders': 0}
+
+
+def test_pending_exposure_counts_towards_stop_loss():
+    risk = RiskEngine()
+    tickets = [risk.reserve(20, 100, 50)[0] for _ in range(2)]
+    assert all(tickets)
+    ticket, reason = risk.reserve(20, 100, 50)
+    assert ticket is None and 'ordens em aberto' in reason
+    risk.cancel(tickets[0])
+    assert risk.reserve(20, 100, 50)[0] is not None
+
+
+def test_limits_use_realized_profit():
+    risk = RiskEngine()
+    ticket, _ = risk.reserve(10, 100, 50); risk.settle(ticket, 100)
+    assert risk.limit_reached(100, 50) == "Meta Stop Win atingida"
+    assert risk.reserve(10, 100, 50) == (None, "Meta Stop Win atingida")
+
+
+def test_simulated_results_do_not_touch_profit():
+    risk = RiskEngine()
+    risk.count_operation(); risk.record_simulated(5); risk.record_simulated(-5)
+    snap = risk.snapshot()
+    assert (snap['total_profit'], snap['total_operations'], snap['wins'], snap['losses']) == (0, 1, 1, 1)
+
+
+def test_concurrent_reservations_never_exceed_the_limit():
+    risk = RiskEngine(); granted = []
+    def worker():
+        for _ in range(100):
+            ticket, _ = risk.reserve(1, 1000, 50)
+            if ticket: granted.append(ticket)
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert len(granted) == 50 and risk.pending_exposure == 50
+
+
+def test_executor_releases_the_reservation_when_buy_raises(tmp_path):
+    from executors import AccountExecutor
+    class Api:
+        def buy(self, *args): raise ConnectionError("websocket fechado")
+    executor = AccountExecutor('t', {'entry_value': 5, 'stop_win': 100, 'stop_loss': 50, 'journal': str(tmp_path / 'j.jsonl')})
+    executor.exnova_api = Api(); executor.connected = True
+    executor._execute('A', {'signal': 'call'}, {'A': 90})
+    assert executor.risk.pending_exposure == 0 and executor.risk.snapshot()['open_orders'] == 0
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⚡ SINALIZADOR ALPHA - Cache de Cotações
+Mantém a vela em formação e a anterior de cada par prestes a operar, pelo
+stream de velas da API (start_candles_stream / get_realtime_candles, lidos da
+memória do websocket). No momento da entrada, o filtro de gap e o preço saem
+daqui, e buy() fica sendo a única chamada de rede. Sem stream, usa as velas do
+CandleStore.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from candle_store import BASE_TIMEFRAME, normalize_candle
+
+logger = logging.getLogger(__name__)
+
+
+class TickCache:
+    """Últimas velas de 1m por par, do stream da API ou, na falta dele, do CandleStore."""
+
+    def __init__(self, candle_store, api_provider, max_streams: int = 10, clock=time):
+        self.candle_store = candle_store
+        self.api_provider = api_provider  # Função que devolve a sessão atual da API (pode mudar ao reconectar)
+        self.max_streams = max_streams
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._streams = OrderedDict()     # par -> True quando o stream já foi assinado (ordem = uso mais recente)
+
+    def watch(self, pair: str):
+        """Assina o stream de velas do par em segundo plano (chamado assim que o sinal é encontrado)."""
+        api = self.api_provider()
+        if api is None or not hasattr(api, 'start_candles_stream'): return
+        with self._lock:
+            if pair in self._streams: self._streams.move_to_end(pair); return
+            self._streams[pair] = False
+            expired = [p for p in list(self._streams)[:-self.max_streams]] if len(self._streams) > self.max_streams else []
+            for old in expired: del self._streams[old]
+        threading.Thread(target=self._subscribe, args=(api, pair, expired), daemon=True).start()
+
+    def _subscribe(self, api, pair, expired):
+        for old in expired:
+            try: api.stop_candles_stream(old, BASE_TIMEFRAME)
+            except Exception as e: logger.debug(f"Erro ao encerrar o stream de {old}: {e}")
+        try:
+            api.start_candles_stream(pair, BASE_TIMEFRAME, 2)
+            with self._lock:
+                if pair in self._streams: self._streams[pair] = True
+        except Exception as e:
+            logger.warning(f"Stream de velas de {pair} indisponível ({e}); usando as velas da varredura.")
+            with self._lock: self._streams.pop(pair, None)
+
+    def _streamed(self, pair):
+        """Velas do stream (antiga -> atual), lidas da memória da API, ou [] se não há stream."""
+        with self._lock:
+            if not self._streams.get(pair): return []
+        try:
+            candles = self.api_provider().get_realtime_candles(pair, BASE_TIMEFRAME) or {}
+            return sorted((normalize_candle(c) for c in candles.values()), key=lambda c: c['timestamp'])
+        except Exception as e:
+            logger.debug(f"Stream de {pair} ilegível: {e}"); return []
+
+    def candle(self, pair: str, timestamp: int, streamed=None):
+        """Vela de 1m que começa em timestamp, do stream ou do CandleStore (None se ainda não chegou)."""
+        for candle in (self._streamed(pair) if streamed is None else streamed):
+            if candle['timestamp'] == timestamp: return candle
+        return self.candle_store.candle_at(pair, timestamp)[0]
+
+    def price(self, pair: str):
+        """
+        Último preço conhecido do par (fechamento da vela mais recente) ou None. Sem
+        stream, é o fechamento da vela em formação da última varredura (até ~60s de
+        atraso), e o aviso vai para o log como no gap não verificado.
+        """
+        streamed = self._streamed(pair)
+        if streamed: return streamed[-1]['close']
+        latest = self.candle_store.candles(pair, BASE_TIMEFRAME, 1)
+        if not latest: return None
+        age = self.clock.time() - latest[-1]['timestamp']
+        logger.warning(f"Preço de {pair} sem stream: fechamento da última varredura (vela aberta há {age:.0f}s).")
+        return latest[-1]['close']
+
+    def has_gap(self, pair: str, entry_ts: int = None):
+        """True se a vela de entrada abriu longe do fechamento anterior; None quando as velas ainda não estão disponíveis."""
+        entry_ts = entry_ts if entry_ts is not None else int(self.clock.time() // BASE_TIMEFRAME * BASE_TIMEFRAME)
+        streamed = self._streamed(pair)  # Uma leitura do stream para as duas velas
+        current = self.candle(pair, entry_ts, streamed); previous = self.candle(pair, entry_ts - BASE_TIMEFRAME, streamed)
+        if current is None or previous is None: return None
+        return current['open'] != previous['close']
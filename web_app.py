@@ -2,19 +2,33 @@
 # -*- coding: utf-8 -*-
 """
 🌐 SINALIZADOR ALPHA - Servidor Web Futurista
-Versão: 5.5 (Corrigido para nova assinatura do método analyze)
+Versão: 5.7 (API REST servida a partir de snapshots imutáveis)
 """
 
+import os
+
+# O servidor assíncrono precisa ser configurado antes de qualquer outro import.
+# eventlet (padrão) sustenta centenas de dashboards; 'threading' usa o servidor de desenvolvimento.
+ASYNC_MODE = os.environ.get('SINALIZADOR_ASYNC_MODE', 'eventlet')
+if ASYNC_MODE == 'eventlet':
+    try:
+        import eventlet
+        eventlet.monkey_patch()
+    except ImportError:
+        ASYNC_MODE = 'threading'
+
 from flask import Flask, render_template, request, jsonify
 from flask_socketio import SocketIO, emit
 import threading
 import time
+import hmac
+from functools import wraps
+from collections import deque, Counter, OrderedDict
+from types import MappingProxyType
 from datetime import datetime, timedelta
 import webbrowser
 from SINALIZADOR_ALPHA_REAL import SinalizadorAlphaReal
-import pandas as pd
 import json
-import os
 import logging
 
 # Configuração de logging para o servidor web
@@ -27,14 +41,186 @@ logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'uma_chave_secreta_muito_forte'
-socketio = SocketIO(app, async_mode='threading')
+socketio = SocketIO(app, async_mode=ASYNC_MODE)
+
+HISTORY_LIMIT = int(os.environ.get('SINALIZADOR_HISTORY_LIMIT', 1000))            # Máximo de sinais mantidos em memória
+LAST_SIGNALS_LIMIT = int(os.environ.get('SINALIZADOR_LAST_SIGNALS_LIMIT', 500))  # Pares lembrados para não repetir o sinal
+HISTORY_PAGE_SIZE = 50      # Sinais por página de histórico
+CLIENT_QUEUE_LIMIT = 200    # Acima disso o cliente é considerado lento e recebe 'resync'
+CLIENT_BATCH_SIZE = 50      # Sinais por envio a cada cliente
+ACK_TIMEOUT = 10.0          # Clientes sem ack voltam a receber após este tempo
+HEARTBEAT_INTERVAL = 30.0   # 'no_signal' só é repetido após este intervalo
+HOST = os.environ.get('SINALIZADOR_HOST', '127.0.0.1')  # '0.0.0.0' expõe o painel na rede local
+API_TOKEN = os.environ.get('SINALIZADOR_API_TOKEN', '')  # Ou config['api_token']; exigido pelas rotas que alteram o bot
 
 bot_instance = None
-last_signals = {}
-signal_history = []
+last_signals = OrderedDict()  # par -> último sinal emitido (os mais antigos saem acima do limite)
+signal_history = deque(maxlen=HISTORY_LIMIT)
+history_lock = threading.Lock()
+last_signal_id = 0
+last_heartbeat = {'time': 0.0, 'had_signals': True}
+clients = {}
+snapshot = None             # Último snapshot publicado; trocado por inteiro, nunca alterado
+snapshot_lock = threading.Lock()  # Só serializa quem publica; leitores não travam
 config = {}
+
+# Chaves que a API pode alterar e o tipo de cada uma
+EDITABLE_CONFIG = {
+    'entry_value': float, 'stop_win': float, 'stop_loss': float, 'expiration': int,
+    'strategy': str, 'operation_mode': str, 'account_type': str,
+    'enable_gap_filter': bool, 'enable_martingale': bool, 'enable_volatility_filter': bool, 'optimized_entry': bool,
+}
+# Chaves de texto com valores fixos: o bot compara por igualdade ('Operar') e repassa account_type à API
+CONFIG_CHOICES = {'operation_mode': ('Operar', 'Analisar'), 'account_type': ('PRACTICE', 'REAL')}
 CONFIG_FILE = 'config_real.json'
 
+class ClientChannel:
+    """Fila de envio de um cliente. Só envia o próximo lote após o ack do anterior (ou timeout)."""
+
+    def __init__(self, sid, last_seen=0):
+        self.sid = sid
+        self.last_seen = last_seen
+        self.queue = deque()
+        self.overflow = False
+        self.inflight_since = None
+        self.lock = threading.Lock()
+
+    def push(self, signals):
+        with self.lock:
+            if len(self.queue) + len(signals) > CLIENT_QUEUE_LIMIT:
+                # Cliente lento: descarta a fila e pede para ele se ressincronizar pelo histórico
+                self.queue.clear(); self.overflow = True
+            else:
+                self.queue.extend(signals)
+
+    def next_batch(self):
+        """Retorna ('resync', None), ('delta', lote) ou (None, None) se nada a enviar."""
+        with self.lock:
+            if self.inflight_since is not None and time.time() - self.inflight_since < ACK_TIMEOUT:
+                return None, None
+            if self.overflow:
+                self.overflow = False; self.inflight_since = None
+                return 'resync', None
+            if not self.queue:
+                return None, None
+            batch = [self.queue.popleft() for _ in range(min(CLIENT_BATCH_SIZE, len(self.queue)))]
+            self.inflight_since = time.time(); self.last_seen = batch[-1]['id']
+            return 'delta', batch
+
+    def ack(self, *args):
+        with self.lock:
+            self.inflight_since = None
+
+def history_page(after=None, before=None, limit=HISTORY_PAGE_SIZE, history=None, pair=None, direction=None, strategy=None):
+    """Página do histórico em ordem cronológica: sinais com id > after e/ou id < before, com filtros opcionais."""
+    limit = max(1, min(int(limit or HISTORY_PAGE_SIZE), HISTORY_PAGE_SIZE))
+    if history is None:
+        with history_lock:
+            history = tuple(signal_history)
+    items = [s for s in history
+             if (after is None or s['id'] > after) and (before is None or s['id'] < before)
+             and (pair is None or s['pair'] == pair) and (direction is None or s['direction'] == direction.upper())
+             and (strategy is None or s.get('strategy') == strategy)]
+    return items[:limit] if after is not None else items[-limit:]
+
+def _freeze(value):
+    """Cópia somente leitura (dicts viram MappingProxyType, listas viram tuplas)."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple, deque)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+def _thaw(value):
+    """Converte um valor do snapshot de volta para tipos serializáveis em JSON."""
+    if isinstance(value, (MappingProxyType, dict)):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, (tuple, list)):
+        return [_thaw(v) for v in value]
+    return value
+
+def strategy_stats(history):
+    """Sinais emitidos e resultados de trades por estratégia."""
+    emitted = Counter(s.get('strategy') for s in history)
+    stats = {name: {'signals': emitted.get(name, 0), 'operations': 0, 'wins': 0, 'losses': 0, 'profit': 0.0}
+             for name in (bot_instance.strategies if bot_instance else {})}
+    for trade in list(bot_instance.signals if bot_instance else []):
+        entry = stats.setdefault(trade.get('strategy'), {'signals': 0, 'operations': 0, 'wins': 0, 'losses': 0, 'profit': 0.0})
+        if trade.get('status') in ('WIN', 'LOSS'):
+            entry['operations'] += 1; entry['profit'] += trade.get('profit', 0)
+            entry['wins' if trade['status'] == 'WIN' else 'losses'] += 1
+    for entry in stats.values():
+        entry['win_rate'] = round(entry['wins'] / entry['operations'] * 100, 2) if entry['operations'] else 0.0
+    return stats
+
+def publish_snapshot(current_signals=None):
+    """Monta e publica um novo snapshot imutável. As rotas REST só leem o snapshot publicado."""
+    global snapshot
+    with snapshot_lock:
+        snapshot = _build_snapshot(snapshot, current_signals)
+    return snapshot
+
+def _build_snapshot(previous, current_signals):
+    bot = bot_instance
+    with history_lock:
+        history = tuple(signal_history)
+    public_config = {k: v for k, v in (bot.config if bot else config).items() if k not in ('password', 'accounts', 'api_token')}
+    return _freeze({
+        'version': (previous['version'] + 1) if previous else 1,
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'signals': current_signals if current_signals is not None else (_thaw(previous['signals']) if previous else []),
+        'history': history,
+        'latest_id': last_signal_id,
+        'stats': {
+            'strategies': strategy_stats(history),
+            'total_profit': bot.total_profit if bot else 0.0, 'total_operations': bot.total_operations if bot else 0,
+            'wins': bot.total_wins if bot else 0, 'losses': bot.total_losses if bot else 0,
+            'pending_exposure': bot.risk.pending_exposure if bot else 0.0,
+            'sweeps': bot.candle_clock.sweeps if bot else 0, 'deadline_misses': bot.candle_clock.deadline_misses if bot else 0,
+            'last_sweep_seconds': round(bot.candle_clock.last_duration, 2) if bot else 0.0,
+        },
+        'pairs': [{'pair': p, 'payout': bot.payouts.get(p, 0), 'eligible': bot.payouts.get(p, 0) >= bot.min_payout}
+                  for p in sorted(bot.available_otc_pairs, key=lambda p: bot.payouts.get(p, 0), reverse=True)] if bot else [],
+        'status': {'connected': bool(bot and bot.connected), 'trading': bool(bot and bot.trading), 'strategy': public_config.get('strategy')},
+        'config': public_config,
+    })
+
+def snapshot_response(payload):
+    """Resposta JSON com ETag da versão do snapshot; GET condicional devolve 304."""
+    current = snapshot or publish_snapshot()
+    response = jsonify(_thaw(payload(current)))
+    response.set_etag(f"v{current['version']}")
+    return response.make_conditional(request)
+
+def publish_signals(signals):
+    """Numera os sinais (versão global crescente), guarda no histórico e enfileira para cada cliente."""
+    global last_signal_id
+    with history_lock:
+        for signal in signals:
+            last_signal_id += 1; signal['id'] = last_signal_id
+            signal_history.append(signal)
+    for channel in list(clients.values()):
+        channel.push(signals)
+
+def publish_heartbeat():
+    """Repete 'no_signal' apenas quando o estado muda ou após HEARTBEAT_INTERVAL."""
+    now = time.time()
+    if last_heartbeat['had_signals'] or now - last_heartbeat['time'] >= HEARTBEAT_INTERVAL:
+        socketio.emit('no_signal', {'message': 'Nenhum sinal de alta assertividade encontrado.', 'latest_id': last_signal_id})
+        last_heartbeat['time'] = now
+    last_heartbeat['had_signals'] = False
+
+def client_sender_loop():
+    """Esvazia as filas dos clientes em lotes, respeitando o ack de cada um."""
+    while True:
+        for channel in list(clients.values()):
+            kind, batch = channel.next_batch()
+            if kind == 'delta':
+                socketio.emit('new_signals', batch, to=channel.sid, callback=channel.ack)
+            elif kind == 'resync':
+                socketio.emit('resync', {'latest_id': last_signal_id, 'last_seen': channel.last_seen}, to=channel.sid)
+        socketio.sleep(0.2)
+
 def load_config():
     """Carrega as configurações do arquivo JSON."""
     global config
@@ -55,7 +241,9 @@ def initialize_bot():
     global bot_instance
     if not bot_instance:
         logger.info("Criando instância do Sinalizador Alpha para o servidor web...")
-        bot_instance = SinalizadorAlphaReal()
+        bot_instance = SinalizadorAlphaReal(gui_mode='web')
+        bot_instance.monitor.sizes.update({'web.signal_history': lambda: len(signal_history), 'web.last_signals': lambda: len(last_signals),
+                                           'web.clients': lambda: len(clients), 'web.client_queues': lambda: sum(len(c.queue) for c in list(clients.values()))})
         
         # Conectar à Exnova em segundo plano
         if bot_instance.config.get('email') and bot_instance.config.get('password'):
@@ -66,13 +254,15 @@ def initialize_bot():
                 daemon=True
             ).start()
         
-        # Iniciar o loop de análise do mercado
+        # Iniciar o loop de análise do mercado e o envio aos clientes
         threading.Thread(target=analyze_market_loop, daemon=True).start()
+        socketio.start_background_task(client_sender_loop)
 
 def analyze_market_loop():
     """Loop de análise de mercado para o servidor web."""
     while True:
         if bot_instance and bot_instance.connected and bot_instance.available_otc_pairs:
+            bot_instance.refresh_strategies()  # Plugins e parâmetros alterados entram entre as varreduras
             selected_strategy_name = bot_instance.config.get('strategy')
             strategy_instance = bot_instance.strategies.get(selected_strategy_name)
 
@@ -82,62 +272,198 @@ def analyze_market_loop():
                 continue
 
             found_signals = []
+            sweep_clock = bot_instance.candle_clock  # Varreduras alinhadas ao fechamento das velas (sweep_offset/sweep_deadline da config)
+            sweep_clock.wait_for_next_candle()
+            planned = bot_instance.pair_scheduler.plan(bot_instance.available_otc_pairs, bot_instance.payouts, bot_instance.min_payout, bot_instance.candle_store.volatility)
+            fetched = []
+            cut = []
+            sweep_clock.begin_sweep()
             
-            for pair in bot_instance.available_otc_pairs:
+            # Pares de maior payout/atividade primeiro; pares abaixo do payout mínimo não são baixados
+            candidates = []
+            for index, pair in enumerate(planned):
+                if bot_instance.is_pending(pair):
+                    continue
+                if sweep_clock.past_deadline():
+                    cut = [p for p in planned[index:] if not bot_instance.is_pending(p)]
+                    break
+                fetched.append(pair)
+                bot_instance.pair_scheduler.mark_scanned(pair)
                 try:
-                    candles = bot_instance.exnova_api.get_candles(pair, 60, 30, time.time())
-                    if candles and len(candles) >= 20:
-                        df = pd.DataFrame(candles)
-                        df.rename(columns={'max': 'high', 'min': 'low'}, inplace=True)
-                        
-                        # CORREÇÃO CRÍTICA: Passar o 'pair' para a função analyze
-                        analysis = strategy_instance.analyze(df, pair)
+                    # Velas de 1m incrementais do armazenamento compartilhado; timeframes maiores são agregados localmente
+                    frames = bot_instance.fetch_pair_frames(pair, strategy_instance)
+                    if frames is not None:
+                        analysis = strategy_instance.analyze_frames(frames)
                         
                         if analysis.get("signal"):
-                            entry_time = (datetime.now().replace(second=0, microsecond=0) + timedelta(minutes=1)).strftime('%H:%M')
-                            signal_id = f"{pair}-{entry_time}"
-                            
-                            # Evita emitir o mesmo sinal repetidamente
-                            if last_signals.get(pair) != signal_id:
-                                signal = {
-                                    "pair": pair,
-                                    "time": entry_time,
-                                    "direction": analysis["signal"].upper(),
-                                    "assertiveness": f'{analysis["assertiveness"]:.2f}%'
-                                }
-                                found_signals.append(signal)
-                                signal_history.append(signal)
-                                last_signals[pair] = signal_id
+                            analysis['pair'] = pair
+                            analysis.setdefault('expiration', strategy_instance.expiration or bot_instance.config.get('expiration', 1))
+                            candidates.append(analysis)
                                 
                 except Exception as e:
                     logger.error(f"Erro ao analisar {pair}: {e}", exc_info=True)
+
+            # Pares cortados pelo prazo não contam como varridos e vêm primeiro na próxima varredura
+            bot_instance.pair_scheduler.defer(cut)
+            sweep_clock.end_sweep(len(fetched), skipped=len(cut))
+
+            # Pares correlacionados no mesmo minuto geram um único sinal (o melhor do grupo).
+            # Com o trading ativo (/api/control/start), os melhores também viram ordens aqui: o loop do bot não roda no modo web.
+            for analysis in bot_instance.finish_sweep(strategy_instance, fetched, candidates):
+                pair = analysis['pair']
+                entry_time = (datetime.now().replace(second=0, microsecond=0) + timedelta(minutes=1)).strftime('%H:%M')
+                signal_id = f"{pair}-{entry_time}"
+                
+                # Evita emitir o mesmo sinal repetidamente
+                if last_signals.get(pair) != signal_id:
+                    signal = {
+                        "pair": pair,
+                        "time": entry_time,
+                        "direction": analysis["signal"].upper(),
+                        "assertiveness": f'{analysis["assertiveness"]:.2f}%',
+                        "expiration": strategy_instance.expiration or bot_instance.config.get('expiration', 1),
+                        "strategy": strategy_instance.name
+                    }
+                    found_signals.append(signal)
+                    bot_instance.pair_scheduler.record_signal(pair)
+                    last_signals[pair] = signal_id; last_signals.move_to_end(pair)
+                    while len(last_signals) > LAST_SIGNALS_LIMIT: last_signals.popitem(last=False)
             
             if found_signals:
-                socketio.emit('new_signals', found_signals)
+                publish_signals(found_signals)
+                last_heartbeat['had_signals'] = True
             else:
-                socketio.emit('no_signal', {'message': 'Nenhum sinal de alta assertividade encontrado.'})
+                publish_heartbeat()
+            publish_snapshot(found_signals)
                 
         else:
             logger.info("Aguardando conexão com a Exnova e carregamento de pares...")
-        
-        time.sleep(5)
+            time.sleep(5)
 
 @app.route('/')
 def index():
     return render_template('index.html')
 
+@app.route('/api/signals')
+def api_signals():
+    """Sinais encontrados na última varredura."""
+    return snapshot_response(lambda snap: {'version': snap['version'], 'generated_at': snap['generated_at'], 'signals': snap['signals'], 'status': snap['status']})
+
+@app.route('/api/history')
+def api_history():
+    """Histórico paginado: ?before=<id>&limit=<n> (páginas mais antigas) ou ?after=<id> (o que falta).
+    Filtros opcionais: pair, direction (CALL/PUT) e strategy."""
+    def payload(snap):
+        page = history_page(after=request.args.get('after', type=int), before=request.args.get('before', type=int),
+                            limit=request.args.get('limit', HISTORY_PAGE_SIZE, type=int), history=snap['history'],
+                            pair=request.args.get('pair'), direction=request.args.get('direction'), strategy=request.args.get('strategy'))
+        filters = {'history': snap['history'], 'pair': request.args.get('pair'), 'direction': request.args.get('direction'), 'strategy': request.args.get('strategy')}
+        # ?after= avança para os mais novos; sem ele a página recua para os mais antigos
+        if not page:
+            has_more = False
+        elif request.args.get('after', type=int) is not None:
+            has_more = bool(history_page(after=page[-1]['id'], limit=1, **filters))
+        else:
+            has_more = bool(history_page(before=page[0]['id'], limit=1, **filters))
+        return {'signals': page, 'latest_id': snap['latest_id'], 'has_more': has_more}
+    return snapshot_response(payload)
+
+@app.route('/api/stats')
+def api_stats():
+    return snapshot_response(lambda snap: snap['stats'])
+
+@app.route('/api/pairs')
+def api_pairs():
+    return snapshot_response(lambda snap: {'pairs': snap['pairs']})
+
+@app.route('/api/config', methods=['GET'])
+def api_get_config():
+    return snapshot_response(lambda snap: snap['config'])
+
+def require_token(view):
+    """Rotas que alteram o bot: exigem o token (cabeçalho X-API-Token ou Authorization: Bearer).
+    Sem token configurado, só aceitam pedidos da própria máquina."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        token = API_TOKEN or (bot_instance.config if bot_instance else config).get('api_token') or ''
+        if token:
+            sent = request.headers.get('X-API-Token') or request.headers.get('Authorization', '').removeprefix('Bearer ').strip()
+            if not hmac.compare_digest(sent.encode('utf-8'), str(token).encode('utf-8')):
+                return jsonify({'error': 'Token inválido ou ausente.'}), 401
+        elif request.remote_addr not in ('127.0.0.1', '::1'):
+            return jsonify({'error': 'Defina SINALIZADOR_API_TOKEN (ou api_token na config) para alterar o bot pela rede.'}), 403
+        return view(*args, **kwargs)
+    return wrapper
+
+@app.route('/api/config', methods=['PUT', 'POST'])
+@require_token
+def api_update_config():
+    """Atualiza as chaves permitidas (EDITABLE_CONFIG) e salva no arquivo, sem a senha."""
+    if not bot_instance:
+        return jsonify({'error': 'Bot não inicializado.'}), 503
+    updates = request.get_json(silent=True) or {}
+    unknown = sorted(set(updates) - set(EDITABLE_CONFIG))
+    if unknown:
+        return jsonify({'error': f'Chaves não editáveis: {", ".join(unknown)}'}), 400
+    try:
+        parsed = {k: (v if isinstance(v, bool) else str(v).lower() in ('1', 'true', 'sim')) if EDITABLE_CONFIG[k] is bool else EDITABLE_CONFIG[k](v)
+                  for k, v in updates.items()}
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': f'Valor inválido: {e}'}), 400
+    invalid = next((k for k, choices in CONFIG_CHOICES.items() if k in parsed and parsed[k] not in choices), None)
+    if invalid:
+        return jsonify({'error': f"Valor inválido para {invalid}: '{parsed[invalid]}' (use {' ou '.join(CONFIG_CHOICES[invalid])})."}), 400
+    if 'strategy' in parsed and parsed['strategy'] not in bot_instance.strategies:
+        return jsonify({'error': f"Estratégia '{parsed['strategy']}' não encontrada."}), 400
+    bot_instance.config.update(parsed)
+    config_to_save = bot_instance.config.copy(); config_to_save.pop('password', None)
+    with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
+        json.dump(config_to_save, f, indent=4)
+    logger.info(f"Configuração alterada pela API: {', '.join(parsed)}")
+    return jsonify(_thaw(publish_snapshot()['config']))
+
+@app.route('/api/control/<action>', methods=['POST'])
+@require_token
+def api_control(action):
+    """Inicia (start) ou para (stop) o trading, executado pelo loop de varredura do servidor."""
+    if action not in ('start', 'stop'):
+        return jsonify({'error': 'Ação inválida. Use start ou stop.'}), 404
+    if not bot_instance or not bot_instance.connected:
+        return jsonify({'error': 'Bot não conectado.'}), 409
+    if action == 'start' and not bot_instance.available_otc_pairs:
+        return jsonify({'error': 'Nenhum par de moeda foi carregado.'}), 409
+    bot_instance.trading = action == 'start'
+    logger.info(f"Trading {'iniciado' if bot_instance.trading else 'parado'} pela API.")
+    return jsonify(_thaw(publish_snapshot()['status']))
+
 @socketio.on('connect')
-def handle_connect():
-    logger.info("Cliente conectado ao servidor web.")
-    emit('status', {'message': 'Conectado ao servidor web.'})
-    emit('signal_history', signal_history)
+def handle_connect(auth=None):
+    # O cliente informa o último id que já viu e recebe apenas o que perdeu
+    last_seen = (auth or {}).get('last_seen') or request.args.get('last_seen', type=int)
+    clients[request.sid] = ClientChannel(request.sid, last_seen or 0)
+    logger.info(f"Cliente conectado ao servidor web ({len(clients)} conectados).")
+    emit('status', {'message': 'Conectado ao servidor web.', 'latest_id': last_signal_id})
+    emit('signal_history', history_page(after=last_seen) if last_seen else history_page())
+
+@socketio.on('disconnect')
+def handle_disconnect():
+    clients.pop(request.sid, None)
+
+@socketio.on('get_history')
+def handle_get_history(data=None):
+    """Paginação pelo socket: {'before': id, 'limit': n}. A página volta no ack."""
+    data = data or {}
+    return history_page(after=data.get('after'), before=data.get('before'), limit=data.get('limit', HISTORY_PAGE_SIZE))
 
 def run_web_server():
     load_config()
     initialize_bot()
-    logger.info("Servidor web iniciado em http://127.0.0.1:5000")
+    logger.info(f"Servidor web iniciado em http://{HOST}:5000")
     webbrowser.open("http://127.0.0.1:5000")
-    socketio.run(app, debug=False, host='0.0.0.0', port=5000, allow_unsafe_werkzeug=True)
+    if ASYNC_MODE == 'threading':
+        socketio.run(app, debug=False, host=HOST, port=5000, allow_unsafe_werkzeug=True)
+    else:
+        socketio.run(app, debug=False, host=HOST, port=5000)
 
 if __name__ == "__main__":
     run_web_server()
\ No newline at end of file